@@ -1,52 +1,85 @@
 import json
-from bs4 import BeautifulSoup
 import frappe
 from frappe import _
-from frappe.desk.form.load import get_docinfo
-from crm.utils.communications import prepare_communication_activity
-from frappe.query_builder import JoinType
+from crm.utils.communications import get_attachments_by_name, prepare_communication_activity
+from frappe.query_builder import Criterion, JoinType, Order
+from frappe.utils.caching import request_cache
+from pypika.functions import Length, Substring
+from pypika.terms import Case
 
-from crm.fcrm.doctype.crm_call_log.crm_call_log import parse_call_log
+from crm.fcrm.doctype.crm_call_log.crm_call_log import parse_call_logs
+from crm.utils.html_parsers import parse_first_link
+
+
+# Fields whose changes are not shown in the activity timeline
+VERSION_AVOID_FIELDS = {
+	"CRM Deal": [
+		"lead",
+		"response_by",
+		"sla_creation",
+		"sla",
+		"first_response_time",
+		"first_responded_on",
+	],
+	"CRM Lead": [
+		"converted",
+		"response_by",
+		"sla_creation",
+		"sla",
+		"first_response_time",
+		"first_responded_on",
+	],
+}
+
+COMMUNICATION_FIELDS = [
+	"name",
+	"communication_type",
+	"communication_date",
+	"communication_medium",
+	"phone_no",
+	"reference_doctype",
+	"reference_name",
+	"creation",
+	"subject",
+	"sender_full_name",
+	"sender",
+	"recipients",
+	"cc",
+	"bcc",
+	"read_by_recipient",
+	"delivery_status",
+]
+# Seconds the parsed changes of a document's versions stay cached after they were last written
+VERSION_CACHE_EXPIRY = 7 * 24 * 60 * 60
+# Characters of communication content sent with paged timelines and feeds, see get_communication_content
+COMMUNICATION_PREVIEW_LENGTH = 2000
 
 
 @frappe.whitelist()
 def get_activities(name, limit=20, offset=0):
 	if frappe.db.exists("CRM Deal", name):
-		return get_deal_activities(name, limit, offset)
+		activities, calls, notes, tasks, attachments = get_deal_activities(name, limit, offset)
 	elif frappe.db.exists("CRM Lead", name):
-		return get_lead_activities(name, limit, offset)
+		activities, calls, notes, tasks, attachments = get_lead_activities(name, limit, offset)
 	else:
 		frappe.throw(_("Document not found"), frappe.DoesNotExistError)
 
+	load_attachments(activities)
+	return activities, calls, notes, tasks, attachments
+
 
 def get_deal_activities(name, limit=20, offset=0):
-	get_docinfo("", "CRM Deal", name)
-	docinfo = frappe.response["docinfo"]
-	deal_meta = frappe.get_meta("CRM Deal")
-	deal_fields = {
-		field.fieldname: {"label": field.label, "options": field.options} for field in deal_meta.fields
-	}
-	avoid_fields = [
-		"lead",
-		"response_by",
-		"sla_creation",
-		"sla",
-		"first_response_time",
-		"first_responded_on",
-	]
+	docinfo = get_timeline_docinfo("CRM Deal", name)
 
 	doc = frappe.db.get_values("CRM Deal", name, ["creation", "owner", "lead"])[0]
 	lead = doc[2]
 
 	activities = []
-	calls = []
-	notes = []
-	tasks = []
 	attachments = []
 	creation_text = _("created this deal")
 
 	if lead:
-		activities, calls, notes, tasks, attachments = get_lead_activities(lead)
+		activities, __, __, __, attachments = get_lead_activities(lead, load_linked=False)
 		creation_text = _("converted the lead to this deal")
 
 	activities.append({
@@ -59,83 +92,22 @@ def get_deal_activities(name, limit=20, offset=0):
 
 	docinfo.versions.reverse()
 
-	for version in docinfo.versions:
-		data = json.loads(version.data)
-		if not data.get("changed"):
-			continue
-
-		if change := data.get("changed")[0]:
-			field = deal_fields.get(change[0], None)
-
-			if not field or change[0] in avoid_fields or (not change[1] and not change[2]):
-				continue
-
-			field_label = field.get("label") or change[0]
-			field_option = field.get("options") or None
-
-			activity_type = "changed"
-			data = {
-				"field": change[0],
-				"field_label": field_label,
-				"old_value": change[1],
-				"value": change[2],
-			}
-
-			if not change[1] and change[2]:
-				activity_type = "added"
-				data = {
-					"field": change[0],
-					"field_label": field_label,
-					"value": change[2],
-				}
-			elif change[1] and not change[2]:
-				activity_type = "removed"
-				data = {
-					"field": change[0],
-					"field_label": field_label,
-					"value": change[1],
-				}
-
-		activity = {
-			"activity_type": activity_type,
-			"creation": version.creation,
-			"owner": version.owner,
-			"data": data,
-			"is_lead": False,
-			"options": field_option,
-		}
-		activities.append(activity)
+	for activity in get_version_activities(docinfo.versions):
+		if activity:
+			activities.append(activity)
 
 	for comment in docinfo.comments:
-		activity = {
-			"name": comment.name,
-			"activity_type": "comment",
-			"creation": comment.creation,
-			"owner": comment.owner,
-			"content": comment.content,
-			"attachments": get_attachments("Comment", comment.name),
-			"is_lead": False,
-		}
-		activities.append(activity)
+		activities.append(get_comment_activity(comment, is_lead=False))
 
 	for communication in docinfo.communications + docinfo.automated_messages:
 		activity = prepare_communication_activity(communication, is_lead=False)
 		activities.append(activity)
 
 	for attachment_log in docinfo.attachment_logs:
-		activity = {
-			"name": attachment_log.get("name"),
-			"activity_type": "attachment_log",
-			"creation": attachment_log.get("creation"),
-			"owner": attachment_log.get("owner"),
-			"data": parse_attachment_log(attachment_log.get("content"), attachment_log.get("comment_type")),
-			"is_lead": False,
-		}
-		activities.append(activity)
+		activities.append(get_attachment_log_activity(attachment_log, is_lead=False))
 
-	calls = calls + get_linked_calls(name).get("calls", [])
-	notes = notes + get_linked_notes(name) + get_linked_calls(name).get("notes", [])
-	tasks = tasks + get_linked_tasks(name) + get_linked_calls(name).get("tasks", [])
+	linked = get_linked_records((lead, name) if lead else (name,))
+	calls, notes, tasks = list(linked.calls), list(linked.notes), list(linked.tasks)
 	attachments = attachments + get_attachments("CRM Deal", name)
 
 	activities.sort(key=lambda x: x["creation"], reverse=True)
@@ -147,21 +119,8 @@ def get_deal_activities(name, limit=20, offset=0):
 	return activities, calls, notes, tasks, attachments
 
 
-def get_lead_activities(name, limit=20, offset=0):
-	get_docinfo("", "CRM Lead", name)
-	docinfo = frappe.response["docinfo"]
-	lead_meta = frappe.get_meta("CRM Lead")
-	lead_fields = {
-		field.fieldname: {"label": field.label, "options": field.options} for field in lead_meta.fields
-	}
-	avoid_fields = [
-		"converted",
-		"response_by",
-		"sla_creation",
-		"sla",
-		"first_response_time",
-		"first_responded_on",
-	]
+def get_lead_activities(name, limit=20, offset=0, load_linked=True):
+	docinfo = get_timeline_docinfo("CRM Lead", name)
 
 	doc = frappe.db.get_values("CRM Lead", name, ["creation", "owner"])[0]
 	activities = [
@@ -177,84 +136,24 @@ def get_lead_activities(name, limit=20, offset=0):
 
 	docinfo.versions.reverse()
 
-	for version in docinfo.versions:
-		data = json.loads(version.data)
-		if not data.get("changed"):
-			continue
-
-		if change := data.get("changed")[0]:
-			field = lead_fields.get(change[0], None)
-
-			if not field or change[0] in avoid_fields or (not change[1] and not change[2]):
-				continue
-
-			field_label = field.get("label") or change[0]
-			field_option = field.get("options") or None
-
-			activity_type = "changed"
-			data = {
-				"field": change[0],
-				"field_label": field_label,
-				"old_value": change[1],
-				"value": change[2],
-			}
-
-			if not change[1] and change[2]:
-				activity_type = "added"
-				data = {
-					"field": change[0],
-					"field_label": field_label,
-					"value": change[2],
-				}
-			elif change[1] and not change[2]:
-				activity_type = "removed"
-				data = {
-					"field": change[0],
-					"field_label": field_label,
-					"value": change[1],
-				}
-
-		activity = {
-			"name": version.name,
-			"activity_type": activity_type,
-			"creation": version.creation,
-			"owner": version.owner,
-			"data": data,
-			"is_lead": True,
-			"options": field_option,
-		}
-		activities.append(activity)
+	for activity in get_version_activities(docinfo.versions):
+		if activity:
+			activities.append(activity)
 
 	for comment in docinfo.comments:
-		activity = {
-			"name": comment.name,
-			"activity_type": "comment",
-			"creation": comment.creation,
-			"owner": comment.owner,
-			"content": comment.content,
-			"attachments": get_attachments("Comment", comment.name),
-			"is_lead": True,
-		}
-		activities.append(activity)
+		activities.append(get_comment_activity(comment, is_lead=True))
 
 	for communication in docinfo.communications + docinfo.automated_messages:
 		activity = prepare_communication_activity(communication, is_lead=True)
 		activities.append(activity)
 
 	for attachment_log in docinfo.attachment_logs:
-		activity = {
-			"name": attachment_log.get("name"),
-			"activity_type": "attachment_log",
-			"creation": attachment_log.get("creation"),
-			"owner": attachment_log.get("owner"),
-			"data": parse_attachment_log(attachment_log.get("content"), attachment_log.get("comment_type")),
-			"is_lead": True,
-		}
-		activities.append(activity)
+		activities.append(get_attachment_log_activity(attachment_log, is_lead=True))
 
-	calls = get_linked_calls(name).get("calls", [])
-	notes = get_linked_notes(name) + get_linked_calls(name).get("notes", [])
-	tasks = get_linked_tasks(name) + get_linked_calls(name).get("tasks", [])
+	calls, notes, tasks = [], [], []
+	if load_linked:
+		linked = get_linked_records((name,))
+		calls, notes, tasks = list(linked.calls), list(linked.notes), list(linked.tasks)
 	attachments = get_attachments("CRM Lead", name)
 
 	activities.sort(key=lambda x: x["creation"], reverse=True)
@@ -282,6 +181,271 @@ def get_lead_activities(name, limit=20, offset=0):
 	return activities, calls, notes, tasks, attachments
 
 
+def get_timeline_docinfo(doctype, name):
+	"""
+	The parts of `frappe.desk.form.load.get_docinfo` the timeline renders
+
+	Only versions, comments, attachment logs, communications and automated messages are read,
+	with the same limits as docinfo.
+	"""
+	frappe.has_permission(doctype, "read", name, throw=True)
+
+	docinfo = frappe._dict(comments=[], attachment_logs=[])
+	docinfo.versions = frappe.get_all(
+		"Version",
+		filters={"ref_doctype": doctype, "docname": name},
+		fields=["name", "owner", "creation", "data", "ref_doctype", "docname"],
+		order_by="creation desc",
+		limit=10,
+	)
+
+	comments = frappe.get_all(
+		"Comment",
+		filters={
+			"reference_doctype": doctype,
+			"reference_name": name,
+			"comment_type": ("in", ["Comment", "Attachment", "Attachment Removed"]),
+		},
+		fields=["name", "creation", "content", "owner", "comment_type"],
+		order_by="creation asc",
+	)
+	for comment in comments:
+		if comment.comment_type == "Comment":
+			docinfo.comments.append(comment)
+		else:
+			docinfo.attachment_logs.append(comment)
+
+	for key, communication_type in [
+		("communications", "Communication"),
+		("automated_messages", "Automated Message"),
+	]:
+		Communication, query = get_communication_query({doctype: name}, [communication_type])
+		docinfo[key] = query.orderby(Communication.creation, order=Order.desc).limit(20).run(as_dict=True)
+
+	return docinfo
+
+
+def get_communication_query(docs, communication_types, preview=False):
+	"""
+	Communications referencing one of `docs` ({doctype: name}) or linked to their timelines
+
+	With `preview`, content is cut like in get_communication_columns.
+	"""
+	Communication = frappe.qb.DocType("Communication")
+	CommunicationLink = frappe.qb.DocType("Communication Link")
+	timeline_links = (
+		frappe.qb.from_(CommunicationLink)
+		.select(CommunicationLink.parent)
+		.where(
+			Criterion.any(
+				(CommunicationLink.link_doctype == doctype) & (CommunicationLink.link_name == name)
+				for doctype, name in docs.items()
+			)
+		)
+	)
+	query = (
+		frappe.qb.from_(Communication)
+		.select(*get_communication_columns(Communication, preview=preview))
+		.where(Communication.communication_type.isin(communication_types))
+		.where(
+			Criterion.any(
+				(Communication.reference_doctype == doctype) & (Communication.reference_name == name)
+				for doctype, name in docs.items()
+			)
+			| Communication.name.isin(timeline_links)
+		)
+	)
+	return Communication, query
+
+
+def get_communication_columns(Communication, preview=False):
+	"""
+	Communication columns shown in timelines
+
+	With `preview`, `content` is cut to COMMUNICATION_PREVIEW_LENGTH characters and
+	`content_truncated` tells whether get_communication_content has the rest.
+	"""
+	if not preview:
+		return [*[Communication[field] for field in COMMUNICATION_FIELDS], Communication.content]
+
+	return [
+		*[Communication[field] for field in COMMUNICATION_FIELDS],
+		Substring(Communication.content, 1, COMMUNICATION_PREVIEW_LENGTH).as_("content"),
+		Case()
+		.when(Length(Communication.content) > COMMUNICATION_PREVIEW_LENGTH, 1)
+		.else_(0)
+		.as_("content_truncated"),
+	]
+
+
+@frappe.whitelist()
+def get_communication_content(name):
+	"""Full content of a communication whose timeline preview was truncated"""
+	frappe.has_permission("Communication", "read", name, throw=True)
+	return frappe.db.get_value("Communication", name, "content")
+
+
+@request_cache
+def get_version_fields(doctype):
+	meta = frappe.get_meta(doctype)
+	return {field.fieldname: {"label": field.label, "options": field.options} for field in meta.fields}
+
+
+def get_version_activities(versions):
+	"""
+	Activities of `versions` of leads and deals, None for the versions that are not shown
+
+	Versions never change, so the field change each one shows is parsed once and cached in a
+	hash per document, read with one HMGET per document. Labels and options are applied from the
+	current meta on every read, so cached changes never go stale. Hashes expire
+	VERSION_CACHE_EXPIRY seconds after they were last written to.
+	"""
+	changes = {}
+	documents = {}
+	for version in versions:
+		documents.setdefault((version.ref_doctype, version.docname), []).append(version)
+	for (doctype, docname), document_versions in documents.items():
+		changes.update(get_version_changes(doctype, docname, document_versions))
+
+	return [
+		get_version_activity(
+			version,
+			changes[version.name],
+			get_version_fields(version.ref_doctype),
+			VERSION_AVOID_FIELDS[version.ref_doctype],
+			is_lead=version.ref_doctype == "CRM Lead",
+		)
+		for version in versions
+	]
+
+
+def get_version_changes(doctype, docname, versions):
+	"""{version name: first field change} of `versions` of one document, parsing uncached ones"""
+	cache = frappe.cache()
+	key = cache.make_key(f"crm_version_activity::{doctype}::{docname}")
+
+	changes = {}
+	uncached = {}
+	cached_changes = cache.hmget(key, [version.name for version in versions])
+	for version, cached in zip(versions, cached_changes, strict=True):
+		if cached is None:
+			changes[version.name] = uncached[version.name] = get_version_change(version)
+		else:
+			changes[version.name] = json.loads(cached)
+
+	if uncached:
+		pipeline = cache.pipeline()
+		mapping = {name: json.dumps(change, default=str) for name, change in uncached.items()}
+		pipeline.hset(key, mapping=mapping)
+		pipeline.expire(key, VERSION_CACHE_EXPIRY)
+		pipeline.execute()
+	return changes
+
+
+def get_version_change(version):
+	"""(field, old value, new value) of the first field change of `version`, or None"""
+	changed = json.loads(version.data).get("changed")
+	return changed[0] if changed else None
+
+
+def cache_version_activity(doc, method=None):
+	"""Parse new versions of leads and deals when they are saved"""
+	if doc.ref_doctype in VERSION_AVOID_FIELDS:
+		get_version_changes(doc.ref_doctype, doc.docname, [doc])
+
+
+def get_version_activity(version, change, fields, avoid_fields, is_lead):
+	"""Activity for `change`, the first field change of `version`, or None when it is not shown"""
+	if not change:
+		return None
+
+	field = fields.get(change[0], None)
+
+	if not field or change[0] in avoid_fields or (not change[1] and not change[2]):
+		return None
+
+	field_label = field.get("label") or change[0]
+	field_option = field.get("options") or None
+
+	activity_type = "changed"
+	data = {
+		"field": change[0],
+		"field_label": field_label,
+		"old_value": change[1],
+		"value": change[2],
+	}
+
+	if not change[1] and change[2]:
+		activity_type = "added"
+		data = {
+			"field": change[0],
+			"field_label": field_label,
+			"value": change[2],
+		}
+	elif change[1] and not change[2]:
+		activity_type = "removed"
+		data = {
+			"field": change[0],
+			"field_label": field_label,
+			"value": change[1],
+		}
+
+	return {
+		"name": version.name,
+		"activity_type": activity_type,
+		"creation": version.creation,
+		"owner": version.owner,
+		"data": data,
+		"is_lead": is_lead,
+		"options": field_option,
+	}
+
+
+def get_comment_activity(comment, is_lead):
+	"""Activity of a comment, rendered from markdown like frappe's docinfo"""
+	return {
+		"name": comment.name,
+		"activity_type": "comment",
+		"creation": comment.creation,
+		"owner": comment.owner,
+		"content": frappe.utils.markdown(comment.content),
+		# filled for a whole page by load_attachments
+		"attachments": [],
+		"is_lead": is_lead,
+	}
+
+
+def get_attachment_log_activity(attachment_log, is_lead):
+	return {
+		"name": attachment_log.get("name"),
+		"activity_type": "attachment_log",
+		"creation": attachment_log.get("creation"),
+		"owner": attachment_log.get("owner"),
+		"data": parse_attachment_log(attachment_log.get("content"), attachment_log.get("comment_type")),
+		"is_lead": is_lead,
+	}
+
+
+def load_attachments(activities):
+	"""Attach files to comment and communication activities with one File query per doctype"""
+	comments = [activity for activity in activities if activity["activity_type"] == "comment"]
+	communications = [activity for activity in activities if activity["activity_type"] == "communication"]
+
+	comment_attachments = get_attachments_by_name("Comment", [activity["name"] for activity in comments])
+	for activity in comments:
+		activity["attachments"] = comment_attachments.get(activity["name"], [])
+
+	communication_attachments = get_attachments_by_name(
+		"Communication", [activity["name"] for activity in communications]
+	)
+	for activity in communications:
+		activity["data"]["attachments"] = communication_attachments.get(activity["name"], [])
+
+
+def is_version_activity(activity):
+	return activity["activity_type"] in ["changed", "added", "removed"]
+
+
 def get_attachments(doctype, name):
 	return (
 		frappe.db.get_all(
@@ -308,7 +472,7 @@ def handle_multiple_versions(versions):
 	grouped_versions = []
 	old_version = None
 	for version in versions:
-		is_version = version["activity_type"] in ["changed", "added", "removed"]
+		is_version = is_version_activity(version)
 		if not is_version:
 			activities.append(version)
 		if not old_version:
@@ -338,130 +502,116 @@ def parse_grouped_versions(versions):
 	version["other_versions"] = other_versions
 	return version
 
-def get_linked_calls(name):
+CALL_LOG_FIELDS = [
+	"name",
+	"caller",
+	"receiver",
+	"from",
+	"to",
+	"duration",
+	"start_time",
+	"end_time",
+	"status",
+	"type",
+	"recording_url",
+	"creation",
+	"note",
+]
+NOTE_FIELDS = ["name", "title", "content", "owner", "modified"]
+TASK_FIELDS = [
+	"name",
+	"title",
+	"description",
+	"assigned_to",
+	"due_date",
+	"priority",
+	"status",
+	"modified",
+]
+
+
+@request_cache
+def get_linked_records(names):
+	"""
+	Calls, notes and tasks of the leads and deals `names` (a tuple), loaded once per request
+
+	Calls referencing the documents or linked to them, the notes and tasks referencing them and
+	those linked through their calls are read with a fixed number of queries.
+	"""
+	names = list(names)
 	calls = frappe.db.get_all(
-		"CRM Call Log",
-		filters={"reference_docname": name},
-		fields=[
-			"name",
-			"caller",
-			"receiver",
-			"from",
-			"to",
-			"duration",
-			"start_time",
-			"end_time",
-			"status",
-			"type",
-			"recording_url",
-			"creation",
-			"note",
-		],
+		"CRM Call Log", filters={"reference_docname": ("in", names)}, fields=CALL_LOG_FIELDS
 	)
 
 	linked_calls = frappe.db.get_all(
-		"Dynamic Link", filters={"link_name": name, "parenttype": "CRM Call Log"}, pluck="parent"
+		"Dynamic Link",
+		filters={"link_name": ("in", names), "parenttype": "CRM Call Log"},
+		pluck="parent",
 	)
 
-	notes = []
-	tasks = []
-
+	call_notes = []
+	call_tasks = []
 	if linked_calls:
 		CallLog = frappe.qb.DocType("CRM Call Log")
 		Link = frappe.qb.DocType("Dynamic Link")
 		query = (
 			frappe.qb.from_(CallLog)
-			.select(
-				CallLog.name,
-				CallLog.caller,
-				CallLog.receiver,
-				CallLog["from"],
-				CallLog.to,
-				CallLog.duration,
-				CallLog.start_time,
-				CallLog.end_time,
-				CallLog.status,
-				CallLog.type,
-				CallLog.recording_url,
-				CallLog.creation,
-				CallLog.note,
-				Link.link_doctype,
-				Link.link_name,
-			)
+			.select(*[CallLog[field] for field in CALL_LOG_FIELDS], Link.link_doctype, Link.link_name)
 			.join(Link, JoinType.inner)
 			.on(Link.parent == CallLog.name)
 			.where(CallLog.name.isin(linked_calls))
 		)
-		_calls = query.run(as_dict=True)
-
-		for call in _calls:
+		for call in query.run(as_dict=True):
 			if call.get("link_doctype") == "FCRM Note":
-				notes.append(call.link_name)
+				call_notes.append(call.link_name)
 			elif call.get("link_doctype") == "CRM Task":
-				tasks.append(call.link_name)
+				call_tasks.append(call.link_name)
+			else:
+				calls.append(call)
+
+	return frappe._dict(
+		calls=parse_call_logs(calls),
+		notes=get_referenced_or_named("FCRM Note", names, call_notes, NOTE_FIELDS),
+		tasks=get_referenced_or_named("CRM Task", names, call_tasks, TASK_FIELDS),
+	)
 
-		_calls = [call for call in _calls if call.get("link_doctype") not in ["FCRM Note", "CRM Task"]]
-		if _calls:
-			calls = calls + _calls
 
-	if notes:
-		notes = frappe.db.get_all(
-			"FCRM Note",
-			filters={"name": ("in", notes)},
-			fields=["name", "title", "content", "owner", "modified"],
-		)
+def get_referenced_or_named(doctype, reference_names, names, fields):
+	"""Records of `doctype` referencing one of `reference_names` or named in `names`, in one query"""
+	or_filters = {"reference_docname": ("in", reference_names)}
+	if names:
+		or_filters["name"] = ("in", names)
+	return frappe.db.get_all(doctype, or_filters=or_filters, fields=fields)
 
-	if tasks:
-		tasks = frappe.db.get_all(
-			"CRM Task",
-			filters={"name": ("in", tasks)},
-			fields=[
-				"name",
-				"title",
-				"description",
-				"assigned_to",
-				"due_date",
-				"priority",
-				"status",
-				"modified",
-			],
-		)
 
-	calls = [parse_call_log(call) for call in calls] if calls else []
+def parse_attachment_log(html, type):
+	type = "added" if type == "Attachment" else "removed"
+	link = parse_first_link(html)
+	if link is None:
+		return parse_attachment_log_with_soup(html, type)
 
-	return {"calls": calls, "notes": notes, "tasks": tasks}
+	found, href, text = link
+	if not found:
+		return {
+			"type": type,
+			"file_name": html.replace("Removed ", ""),
+			"file_url": "",
+			"is_private": False,
+		}
 
+	return {
+		"type": type,
+		"file_name": text,
+		"file_url": href,
+		"is_private": "private/files" in href,
+	}
 
-def get_linked_notes(name):
-	notes = frappe.db.get_all(
-		"FCRM Note",
-		filters={"reference_docname": name},
-		fields=["name", "title", "content", "owner", "modified"],
-	)
-	return notes or []
-
-
-def get_linked_tasks(name):
-	tasks = frappe.db.get_all(
-		"CRM Task",
-		filters={"reference_docname": name},
-		fields=[
-			"name",
-			"title",
-			"description",
-			"assigned_to",
-			"due_date",
-			"priority",
-			"status",
-			"modified",
-		],
-	)
-	return tasks or []
 
-def parse_attachment_log(html, type):
+def parse_attachment_log_with_soup(html, type):
+	from bs4 import BeautifulSoup
+
 	soup = BeautifulSoup(html, "html.parser")
 	a_tag = soup.find("a")
-	type = "added" if type == "Attachment" else "removed"
 	if not a_tag:
 		return {
 			"type": type,
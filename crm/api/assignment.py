@@ -1,8 +1,21 @@
+import json
+
 import frappe
 from frappe import _
 from frappe.desk.form.assign_to import add as frappe_assign_to
 from frappe.desk.form.assign_to import remove as frappe_remove_assign
 from frappe.desk.form.assign_to import get
+from frappe.utils import create_batch
+from pypika.terms import Case
+
+from crm.api.count_cache import clear_count_cache
+from crm.api.todo import notify_assigned_user
+from crm.fcrm.doctype.crm_assignment_index.crm_assignment_index import ASSIGNMENT_INDEX_DOCTYPES
+from crm.fcrm.doctype.crm_notification.crm_notification import notify_user
+from crm.fcrm.doctype.crm_record_visibility.crm_record_visibility import update_visibility
+
+BULK_ASSIGNMENT_BATCH_SIZE = 200
+BULK_ASSIGNMENT_INLINE_LIMIT = 20
 
 
 @frappe.whitelist()
@@ -27,8 +40,7 @@ def add_with_retry(args=None, retry_count=3):
             return result
         except Exception as e:
             error_message = str(e)
-            # Check if it's a deadlock error
-            is_deadlock = "Deadlock found when trying to get lock" in error_message
+            is_deadlock = frappe.db.is_deadlocked(e)
             
             if is_deadlock and attempt < retry_count - 1:
                 # Log the deadlock and continue with retry
@@ -52,27 +64,21 @@ def add_multiple_with_retry(args=None, retry_count=3):
         retry_count: Number of retries in case of deadlock
     
     Returns:
-        Assignment details
+        Bulk assignment summary, see `bulk_assign`
     """
     if not args:
         args = frappe.local.form_dict
-    
-    import json
-    docname_list = json.loads(args["name"])
-    results = []
-    
-    for docname in docname_list:
-        args_copy = args.copy()
-        args_copy.update({"name": docname})
-        try:
-            result = add_with_retry(args_copy, retry_count)
-            results.append(result)
-        except Exception as e:
-            frappe.log_error(_("Error assigning to {0}: {1}").format(docname, str(e)))
-            # Continue with other assignments even if one fails
-            continue
-    
-    return results
+
+    if frappe.parse_json(args.get("re_assign")):
+        frappe.throw(_("Reassigning is not supported for multiple documents, remove the current assignments first"))
+
+    return bulk_assign(
+        args.get("doctype"),
+        args.get("name"),
+        args.get("assign_to"),
+        description=args.get("description"),
+        retry_count=retry_count,
+    )
 
 
 @frappe.whitelist()
@@ -105,8 +111,7 @@ def remove_with_retry(doctype=None, name=None, assign_to=None, retry_count=3):
             return result
         except Exception as e:
             error_message = str(e)
-            # Check if it's a deadlock error
-            is_deadlock = "Deadlock found when trying to get lock" in error_message
+            is_deadlock = frappe.db.is_deadlocked(e)
             
             if is_deadlock and attempt < retry_count - 1:
                 # Log the deadlock and continue with retry
@@ -117,4 +122,336 @@ def remove_with_retry(doctype=None, name=None, assign_to=None, retry_count=3):
                 frappe.log_error(_("Error in unassignment: {0}").format(error_message))
                 frappe.throw(_("Error while unassigning: {0}").format(error_message))
     
-    frappe.throw(_("Failed to unassign after multiple attempts")) 
\ No newline at end of file
+    frappe.throw(_("Failed to unassign after multiple attempts")) 
+
+@frappe.whitelist()
+def bulk_assign(doctype, names, assign_to, action="add", description=None, retry_count=3):
+    """
+    Assign (or with action="remove", unassign) users to many documents at once.
+
+    Runs in the background for more than BULK_ASSIGNMENT_INLINE_LIMIT documents and
+    publishes `crm_bulk_assignment_progress` events to the user. Like
+    `frappe.desk.form.assign_to`, only documents the user can write are changed, the
+    others are reported as failed.
+
+    Args:
+        doctype: DocType of the documents
+        names: List (or JSON list) of document names
+        assign_to: List (or JSON list) of users
+        action: "add" or "remove"
+        description: ToDo description for new assignments
+        retry_count: Number of retries of a batch in case of deadlock
+
+    Returns:
+        dict with the number of documents, whether the job was queued and, when it
+        was not, the documents that failed
+    """
+    if action not in ("add", "remove"):
+        frappe.throw(_("Invalid assignment action: {0}").format(action))
+
+    names = sorted(set(frappe.parse_json(names)))
+    assign_to = frappe.parse_json(assign_to)
+    if isinstance(assign_to, str):
+        assign_to = [assign_to]
+    users = sorted(set(assign_to))
+
+    frappe.has_permission(doctype, "write", throw=True)
+
+    kwargs = {
+        "doctype": doctype,
+        "names": names,
+        "users": users,
+        "action": action,
+        "description": description,
+        "retry_count": retry_count,
+    }
+    if len(names) > BULK_ASSIGNMENT_INLINE_LIMIT:
+        frappe.enqueue(process_bulk_assignment, queue="long", **kwargs)
+        return {"count": len(names), "queued": True, "failed": []}
+
+    failed = process_bulk_assignment(**kwargs)
+    return {"count": len(names), "queued": False, "failed": failed}
+
+
+def process_bulk_assignment(doctype, names, users, action="add", description=None, retry_count=3):
+    """
+    Apply a bulk assignment batch by batch, committing each batch.
+
+    Documents are processed and locked in name order, so concurrent bulk
+    assignments acquire row locks in the same order and can't deadlock each other.
+    Returns the names that failed or that the user can't write.
+    """
+    processed = 0
+    failed = []
+    for batch in create_batch(names, BULK_ASSIGNMENT_BATCH_SIZE):
+        for attempt in range(retry_count):
+            try:
+                if action == "add":
+                    denied = assign_batch(doctype, batch, users, description)
+                else:
+                    denied = unassign_batch(doctype, batch, users)
+                frappe.db.commit()
+                failed.extend(denied)
+                break
+            except Exception as e:
+                frappe.db.rollback()
+                if frappe.db.is_deadlocked(e) and attempt < retry_count - 1:
+                    frappe.log_error(_("Deadlock detected in bulk assignment, retrying... (Attempt {0}/{1})").format(attempt + 1, retry_count))
+                    continue
+                frappe.log_error(_("Error in bulk assignment: {0}").format(str(e)))
+                failed.extend(batch)
+                break
+
+        processed += len(batch)
+        frappe.publish_realtime(
+            "crm_bulk_assignment_progress",
+            {
+                "doctype": doctype,
+                "action": action,
+                "processed": processed,
+                "total": len(names),
+                "failed": failed,
+            },
+            user=frappe.session.user,
+        )
+
+    clear_count_cache(doctype)
+    frappe.publish_realtime("list_update", {"doctype": doctype}, after_commit=True)
+    return failed
+
+
+def assign_batch(doctype, names, users, description=None):
+    """Assign `users` to the writable documents of `names` and return the others"""
+    permitted = get_permitted_names(doctype, lock_documents(doctype, names))
+    denied = [name for name in names if name not in permitted]
+    names = permitted
+    if not names:
+        return denied
+
+    existing = set(
+        frappe.get_all(
+            "ToDo",
+            filters={
+                "reference_type": doctype,
+                "reference_name": ("in", names),
+                "allocated_to": ("in", users),
+                "status": "Open",
+            },
+            fields=["reference_name", "allocated_to"],
+            as_list=True,
+        )
+    )
+    assignments = [(name, user) for name in names for user in users if (name, user) not in existing]
+    if not assignments:
+        return denied
+
+    now = frappe.utils.now()
+    today = frappe.utils.nowdate()
+    assigned_by = frappe.session.user
+    frappe.db.bulk_insert(
+        "ToDo",
+        fields=[
+            "name", "owner", "modified_by", "creation", "modified", "status", "priority", "date",
+            "allocated_to", "description", "reference_type", "reference_name", "assigned_by",
+        ],
+        values=[
+            (
+                frappe.generate_hash(length=10), assigned_by, assigned_by, now, now, "Open", "Medium", today,
+                user, description or _("Assignment for {0} {1}").format(_(doctype), name), doctype, name, assigned_by,
+            )
+            for name, user in assignments
+        ],
+    )
+
+    share_documents(doctype, assignments)
+    update_assign_field(doctype, names)
+    set_empty_owners(doctype, names, users[0])
+    update_visibility(doctype, names, users)
+
+    if doctype in ASSIGNMENT_INDEX_DOCTYPES:
+        frappe.db.bulk_insert(
+            "CRM Assignment Index",
+            fields=["name", "reference_doctype", "reference_name", "user", "creation", "modified", "owner", "modified_by"],
+            values=[
+                (frappe.generate_hash(length=10), doctype, name, user, now, now, assigned_by, assigned_by)
+                for name, user in assignments
+            ],
+        )
+
+    notify_assignees(doctype, assignments)
+    return denied
+
+
+def unassign_batch(doctype, names, users):
+    """Unassign `users` from the writable documents of `names` and return the others"""
+    permitted = get_permitted_names(doctype, lock_documents(doctype, names))
+    denied = [name for name in names if name not in permitted]
+    names = permitted
+    if not names:
+        return denied
+
+    todos = frappe.get_all(
+        "ToDo",
+        filters={
+            "reference_type": doctype,
+            "reference_name": ("in", names),
+            "allocated_to": ("in", users),
+            "status": "Open",
+        },
+        fields=["name", "reference_name", "allocated_to"],
+    )
+    if not todos:
+        return denied
+
+    frappe.db.set_value("ToDo", {"name": ("in", [todo.name for todo in todos])}, "status", "Cancelled")
+
+    assignments = [(todo.reference_name, todo.allocated_to) for todo in todos]
+    for user, user_names in group_names_by_user(assignments).items():
+        frappe.db.delete("DocShare", {"share_doctype": doctype, "share_name": ("in", user_names), "user": user})
+        frappe.db.delete(
+            "CRM Assignment Index",
+            {"reference_doctype": doctype, "reference_name": ("in", user_names), "user": user},
+        )
+
+    update_assign_field(doctype, names)
+    update_visibility(doctype, names, users)
+    notify_assignees(doctype, assignments, is_cancelled=True)
+    return denied
+
+
+def lock_documents(doctype, names):
+    """Lock the rows of `names` in name order and return the names that exist"""
+    Table = frappe.qb.DocType(doctype)
+    return (
+        frappe.qb.from_(Table)
+        .select(Table.name)
+        .where(Table.name.isin(names))
+        .orderby(Table.name)
+        .for_update()
+        .run(pluck=True)
+    )
+
+
+def get_permitted_names(doctype, names):
+    """Names of `names` the user can write, as `frappe.desk.form.assign_to` requires"""
+    return [name for name in names if frappe.has_permission(doctype, "write", doc=name)]
+
+
+def share_documents(doctype, assignments):
+    """Share the assigned documents with their assignees, like `crm.api.todo.share_on_assignment`"""
+    now = frappe.utils.now()
+    for user, user_names in group_names_by_user(assignments).items():
+        shared = frappe.get_all(
+            "DocShare",
+            filters={"share_doctype": doctype, "share_name": ("in", user_names), "user": user},
+            fields=["name", "share_name"],
+        )
+        if shared:
+            frappe.db.set_value(
+                "DocShare",
+                {"name": ("in", [share.name for share in shared])},
+                {"read": 1, "write": 1, "share": 0, "notify": 1},
+            )
+
+        shared_names = {share.share_name for share in shared}
+        frappe.db.bulk_insert(
+            "DocShare",
+            fields=[
+                "name", "owner", "modified_by", "creation", "modified", "user", "share_doctype", "share_name",
+                "read", "write", "share", "everyone", "notify",
+            ],
+            values=[
+                (
+                    frappe.generate_hash(length=10), frappe.session.user, frappe.session.user, now, now, user,
+                    doctype, name, 1, 1, 0, 0, 1,
+                )
+                for name in user_names
+                if name not in shared_names
+            ],
+        )
+
+
+def update_assign_field(doctype, names):
+    """Rebuild `_assign` of all `names` from their open ToDos with a single UPDATE"""
+    assignments = frappe.get_all(
+        "ToDo",
+        filters={
+            "reference_type": doctype,
+            "reference_name": ("in", names),
+            "status": ("not in", ("Cancelled", "Closed")),
+            "allocated_to": ("is", "set"),
+        },
+        fields=["reference_name", "allocated_to"],
+        order_by="modified asc",
+    )
+
+    assigned_users = {name: [] for name in names}
+    for assignment in assignments:
+        if assignment.allocated_to not in assigned_users[assignment.reference_name]:
+            assigned_users[assignment.reference_name].append(assignment.allocated_to)
+
+    Table = frappe.qb.DocType(doctype)
+    assign_value = Case()
+    for name, users in assigned_users.items():
+        assign_value = assign_value.when(Table.name == name, json.dumps(users))
+
+    frappe.qb.update(Table).set(Table._assign, assign_value).where(Table.name.isin(names)).run()
+
+
+def set_empty_owners(doctype, names, user):
+    """Set `lead_owner`/`deal_owner` of unowned documents, like `crm.api.todo.after_insert`"""
+    fieldname = {"CRM Lead": "lead_owner", "CRM Deal": "deal_owner"}.get(doctype)
+    if not fieldname:
+        return
+
+    Table = frappe.qb.DocType(doctype)
+    (
+        frappe.qb.update(Table)
+        .set(Table[fieldname], user)
+        .where(Table.name.isin(names))
+        .where(Table[fieldname].isnull() | (Table[fieldname] == ""))
+        .run()
+    )
+
+
+def notify_assignees(doctype, assignments, is_cancelled=False):
+    """Send each assignee one notification per batch instead of one per document"""
+    if doctype not in ["CRM Lead", "CRM Deal", "CRM Task"]:
+        return
+
+    for user, user_names in group_names_by_user(assignments).items():
+        todo = frappe._dict(reference_type=doctype, reference_name=user_names[0], allocated_to=user)
+        if len(user_names) == 1:
+            notify_assigned_user(todo, is_cancelled=is_cancelled)
+            continue
+
+        owner = frappe.get_cached_value("User", frappe.session.user, "full_name")
+        message = (
+            _("Your assignments on {0} {1} have been removed by {2}").format(len(user_names), _(doctype), owner)
+            if is_cancelled
+            else _("{0} assigned {1} {2} to you").format(owner, len(user_names), _(doctype))
+        )
+        notify_user(
+            {
+                "owner": frappe.session.user,
+                "assigned_to": user,
+                "notification_type": "Assignment",
+                "message": message,
+                "notification_text": f"""
+                    <div class="mb-2 leading-5 text-ink-gray-5">
+                        <span>{ message }</span>
+                    </div>
+                """,
+                "reference_doctype": doctype,
+                "reference_docname": user_names[0],
+                "redirect_to_doctype": doctype,
+                "redirect_to_docname": user_names[0],
+            }
+        )
+
+
+def group_names_by_user(assignments):
+    names_by_user = {}
+    for name, user in assignments:
+        names_by_user.setdefault(user, []).append(name)
+    return names_by_user
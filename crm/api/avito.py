@@ -97,24 +97,26 @@ def notify_agent(doc):
 def get_lead_or_deal_from_number(number):
     """Get lead/deal from the given number."""
 
-    def find_record(doctype, mobile_no, where=""):
-        mobile_no = parse_mobile_no(mobile_no)
-
-        query = f"""
-            SELECT name, mobile_no
-            FROM `tab{doctype}`
-            WHERE CONCAT('+', REGEXP_REPLACE(mobile_no, '[^0-9]', '')) = {mobile_no}
-        """
+    def find_record(doctype, mobile_no, filters=None):
+        # mobile numbers are indexed in E.164, compare them with an indexed equality
+        mobile_no = "+" + parse_mobile_no(mobile_no).lstrip("+")
+        names = frappe.get_all(
+            "CRM Phone Index",
+            filters={"e164": mobile_no, "reference_doctype": doctype, "is_primary": 1},
+            pluck="reference_name",
+        )
+        if not names:
+            return None
 
-        data = frappe.db.sql(query + where, as_dict=True)
-        return data[0].name if data else None
+        data = frappe.get_all(doctype, filters={"name": ("in", names), **(filters or {})}, pluck="name", limit=1)
+        return data[0] if data else None
 
     doctype = "CRM Deal"
 
     doc = find_record(doctype, number) or None
     if not doc:
         doctype = "CRM Lead"
-        doc = find_record(doctype, number, "AND converted is not True")
+        doc = find_record(doctype, number, {"converted": 0})
         if not doc:
             doc = find_record(doctype, number)
 
@@ -0,0 +1,138 @@
+from contextlib import contextmanager
+
+import frappe
+from frappe import _
+from frappe.model import no_value_fields
+from frappe.utils import create_batch
+
+from crm.api.assignment import notify_assignees
+from crm.api.count_cache import clear_count_cache
+from crm.api.doc import convert_filter_to_tuple, resolve_filters
+
+BULK_UPDATE_DOCTYPES = ["CRM Lead", "CRM Deal"]
+BULK_UPDATE_CHUNK_SIZE = 100
+
+
+@frappe.whitelist()
+def bulk_update(doctype, values, names=None, filters=None):
+	"""
+	Set `values` on many leads or deals in a background job
+
+	Documents are selected by `names` or by list view `filters`. Progress is published to the
+	user as `crm_bulk_update_progress` events carrying the returned `job_id`.
+	"""
+	if doctype not in BULK_UPDATE_DOCTYPES:
+		frappe.throw(_("Bulk update is not supported for {0}").format(_(doctype)))
+
+	frappe.has_permission(doctype, "write", throw=True)
+	values = frappe.parse_json(values)
+	validate_bulk_update_values(doctype, values)
+
+	if names:
+		names = frappe.parse_json(names)
+	else:
+		filters = resolve_filters(doctype, frappe.parse_json(filters or "{}"))
+		names = frappe.get_list(
+			doctype, filters=convert_filter_to_tuple(doctype, filters), pluck="name", page_length=0
+		)
+
+	job_id = frappe.generate_hash(length=10)
+	frappe.enqueue(
+		process_bulk_update,
+		queue="long",
+		timeout=6 * 60 * 60,
+		job_id=job_id,
+		doctype=doctype,
+		names=sorted(set(names)),
+		values=values,
+	)
+	return {"job_id": job_id, "count": len(names)}
+
+
+def validate_bulk_update_values(doctype, values):
+	if not values or not isinstance(values, dict):
+		frappe.throw(_("Nothing to update"))
+
+	meta = frappe.get_meta(doctype)
+	for fieldname in values:
+		field = meta.get_field(fieldname)
+		if not field or field.fieldtype in no_value_fields or field.read_only:
+			frappe.throw(_("Field {0} can't be updated in bulk").format(fieldname))
+
+
+def process_bulk_update(job_id, doctype, names, values):
+	"""
+	Save documents chunk by chunk, committing each chunk
+
+	Every document still goes through validation and its hooks, but while a chunk is saved
+	`crm.api.doc.on_doc_update` and `crm.api.todo.notify_assigned_user` only record what
+	they would publish, see `bulk_update_context`, and frappe's own per document realtime
+	events are turned off. Realtime updates and notifications are then sent once per chunk,
+	as a `docs_update` event handled by the frontend like a `doc_update` of each document.
+	"""
+	updated = 0
+	failed = []
+	for chunk in create_batch(names, BULK_UPDATE_CHUNK_SIZE):
+		with bulk_update_context() as context:
+			for name in chunk:
+				frappe.db.savepoint("crm_bulk_update")
+				# side effects recorded by a save that is rolled back are dropped with it
+				recorded = len(context.names), len(context.notifications)
+				try:
+					doc = frappe.get_doc(doctype, name)
+					doc.check_permission("write")
+					doc.update(values)
+					# the chunk is published once below instead of a realtime event per document
+					doc.flags.notify_update = False
+					doc.save()
+					updated += 1
+				except Exception as e:
+					frappe.db.rollback(save_point="crm_bulk_update")
+					del context.names[recorded[0] :]
+					del context.notifications[recorded[1] :]
+					frappe.clear_last_message()
+					failed.append({"name": name, "error": str(e)})
+
+		flush_bulk_notifications(context.notifications)
+		frappe.db.commit()
+
+		clear_count_cache(doctype)
+		if context.names:
+			frappe.publish_realtime(
+				"docs_update",
+				{"doctype": doctype, "names": context.names, "data": {"event": "modified"}},
+			)
+		frappe.publish_realtime(
+			"crm_bulk_update_progress",
+			{
+				"job_id": job_id,
+				"doctype": doctype,
+				"updated": updated,
+				"failed": failed,
+				"total": len(names),
+			},
+			user=frappe.session.user,
+		)
+
+
+@contextmanager
+def bulk_update_context():
+	"""Collect the per document side effects of saves into `frappe.flags.crm_bulk_update`"""
+	context = frappe._dict(names=[], notifications=[])
+	frappe.flags.crm_bulk_update = context
+	try:
+		yield context
+	finally:
+		frappe.flags.crm_bulk_update = None
+
+
+def flush_bulk_notifications(notifications):
+	"""Send the assignment notifications collected while saving a chunk, one per user and doctype"""
+	grouped = {}
+	for reference_type, reference_name, allocated_to, is_cancelled in notifications:
+		assignments = grouped.setdefault((reference_type, is_cancelled), [])
+		if (reference_name, allocated_to) not in assignments:
+			assignments.append((reference_name, allocated_to))
+
+	for (reference_type, is_cancelled), assignments in grouped.items():
+		notify_assignees(reference_type, assignments, is_cancelled=is_cancelled)
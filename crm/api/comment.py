@@ -2,8 +2,8 @@ from collections.abc import Iterable
 
 import frappe
 from frappe import _
-from bs4 import BeautifulSoup
 from crm.fcrm.doctype.crm_notification.crm_notification import notify_user
+from crm.utils.html_parsers import parse_mentions
 
 
 def on_update(self, method):
@@ -79,6 +79,16 @@ def notify_mentions(doc):
 def extract_mentions(html):
     if not html:
         return []
+
+    mentions = parse_mentions(html)
+    if mentions is None:
+        return extract_mentions_with_soup(html)
+    return mentions
+
+
+def extract_mentions_with_soup(html):
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "html.parser")
     mentions = []
     for d in soup.find_all("span", attrs={"data-type": "mention"}):
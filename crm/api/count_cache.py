@@ -0,0 +1,83 @@
+import hashlib
+import json
+
+import frappe
+from frappe.model.db_query import DatabaseQuery
+from frappe.utils import cint
+
+# Doctypes whose cached counts are invalidated by `crm.api.doc.on_doc_update`
+COUNT_CACHE_DOCTYPES = ["CRM Lead", "CRM Deal", "CRM Task"]
+COUNT_CACHE_TTL = 60
+
+
+@frappe.whitelist()
+def get_total_count(doctype: str, filters=None):
+	"""
+	Get the exact number of records of `doctype` matching `filters` for the current user
+
+	Counts of doctypes in COUNT_CACHE_DOCTYPES are cached for COUNT_CACHE_TTL seconds,
+	keyed by doctype, normalized filters and permission scope.
+	"""
+	filters = frappe.parse_json(filters or "{}")
+
+	if doctype not in COUNT_CACHE_DOCTYPES:
+		return count_records(doctype, filters)
+
+	cache_key = get_count_cache_key(doctype, filters)
+	total_count = frappe.cache().get_value(cache_key)
+	if total_count is None:
+		total_count = count_records(doctype, filters)
+		frappe.cache().set_value(cache_key, total_count, expires_in_sec=COUNT_CACHE_TTL)
+	return total_count
+
+
+def get_estimated_count(doctype, filters=None):
+	"""
+	Get the approximate row count of `doctype` from table statistics
+
+	Returns None when the estimate would not match what the user can see,
+	i.e. when filters or permission conditions apply.
+	"""
+	if filters or get_permission_scope(doctype):
+		return None
+
+	if frappe.db.db_type == "postgres":
+		estimate = frappe.db.sql(
+			"select reltuples from pg_class where relname = %s",
+			(f"tab{doctype}",),
+		)
+	else:
+		estimate = frappe.db.sql(
+			"""select table_rows from information_schema.tables
+			where table_schema = database() and table_name = %s""",
+			(f"tab{doctype}",),
+		)
+
+	if not estimate or estimate[0][0] is None:
+		return None
+	return max(cint(estimate[0][0]), 0)
+
+
+def count_records(doctype, filters):
+	return frappe.get_list(doctype, filters=filters, fields="count(*) as total_count")[0].total_count
+
+
+def get_permission_scope(doctype):
+	"""Match conditions (permission query conditions, user permissions) applied to the current user"""
+	return DatabaseQuery(doctype).build_match_conditions()
+
+
+def get_count_cache_key(doctype, filters):
+	normalized_filters = json.dumps(filters, sort_keys=True, default=str)
+	scope = get_permission_scope(doctype)
+	digest = hashlib.md5(f"{normalized_filters}|{scope}".encode()).hexdigest()
+	return f"crm_total_count::{doctype}::{get_count_cache_version(doctype)}::{digest}"
+
+
+def get_count_cache_version(doctype):
+	return frappe.cache().get_value(f"crm_total_count_version::{doctype}") or "0"
+
+
+def clear_count_cache(doctype):
+	"""Invalidate every cached count of `doctype` by moving it to a new cache version"""
+	frappe.cache().set_value(f"crm_total_count_version::{doctype}", frappe.generate_hash(length=10))
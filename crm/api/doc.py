@@ -1,18 +1,35 @@
+import base64
 import json
 
 import frappe
 from frappe import _
 from frappe.custom.doctype.property_setter.property_setter import make_property_setter
 from frappe.desk.form.assign_to import set_status
-from frappe.model import no_value_fields
+from frappe.model import default_fields, no_value_fields
 from frappe.model.document import get_controller
-from frappe.utils import make_filter_tuple
+from frappe.utils import cint, create_batch, flt, make_filter_tuple
 from pypika import Criterion
 
+from crm.api.count_cache import (
+	COUNT_CACHE_DOCTYPES,
+	clear_count_cache,
+	get_estimated_count,
+	get_total_count,
+)
+from crm.api.view_schema import STANDARD_FIELDS, get_view_schema
 from crm.api.views import get_views
-from crm.fcrm.doctype.crm_form_script.crm_form_script import get_form_script
+from crm.fcrm.doctype.crm_assignment_index.crm_assignment_index import (
+	ASSIGNMENT_INDEX_DOCTYPES,
+	get_assigned_condition,
+)
+from crm.fcrm.doctype.crm_deletion_log.crm_deletion_log import get_deleted_names, log_deletion
 from .performance import track_performance
-from crm.utils import get_dynamic_linked_docs, get_linked_docs
+from crm.utils import get_linked_docs_for_names
+
+GROUP_BY_SUM_FIELDS = ["annual_revenue", "deal_value"]
+BULK_DELETE_CHUNK_SIZE = 200
+# Rows get_data_delta returns before asking the client to reload the whole view
+DELTA_ROW_LIMIT = 500
 
 
 @frappe.whitelist()
@@ -305,9 +322,11 @@ def get_data(
 	kanban_fields=[],
 	view=None,
 	default_filters=None,
+	count_mode=None,
+	cursor=None,
+	schema_hash=None,
 ):
 	custom_view = False
-	filters = frappe._dict(filters)
 	rows = frappe.parse_json(rows or "[]")
 	columns = frappe.parse_json(columns or "[]")
 	kanban_fields = frappe.parse_json(kanban_fields or "[]")
@@ -317,31 +336,11 @@ def get_data(
 	view_type = view.get("view_type") if view else None
 	group_by_field = view.get("group_by_field") if view else None
 
-	for key in filters:
-		value = filters[key]
-		if isinstance(value, list):
-			if "@me" in value:
-				value[value.index("@me")] = frappe.session.user
-			elif "%@me%" in value:
-				index = [i for i, v in enumerate(value) if v == "%@me%"]
-				for i in index:
-					value[i] = "%" + frappe.session.user + "%"
-			# Handle _assign field filtering
-			elif key == "_assign" and len(value) == 2 and value[0] == "assigned_user":
-				# Get user email by name
-				user_email = frappe.db.get_value("User", value[1], "email")
-				if user_email:
-					# Convert to LIKE filter for JSON field
-					filters[key] = ["LIKE", f"%{user_email}%"]
-		elif value == "@me":
-			filters[key] = frappe.session.user
-
-	if default_filters:
-		default_filters = frappe.parse_json(default_filters)
-		filters.update(default_filters)
+	filters = resolve_filters(doctype, filters, default_filters)
 
 	is_default = True
 	data = []
+	next_cursor = None
 	_list = get_controller(doctype)
 	default_rows = []
 	if hasattr(_list, "default_list_data"):
@@ -399,17 +398,7 @@ def get_data(
 		if group_by_field and group_by_field not in rows:
 			rows.append(group_by_field)
 
-		data = (
-			frappe.get_list(
-				doctype,
-				fields=rows,
-				filters=filters,
-				order_by=order_by,
-				page_length=page_length,
-			)
-			or []
-		)
-		data = parse_list_data(data, doctype)
+		data, next_cursor = get_list_page(doctype, rows, filters, order_by, page_length, cursor)
 
 	if view_type == "kanban":
 		if not rows:
@@ -445,46 +434,44 @@ def get_data(
 			if field not in rows:
 				rows.append(field)
 
+		def is_column_hidden(kc):
+			return (column_field in filters and filters.get(column_field) != kc.get("name")) or kc.get("delete")
+
+		visible_columns = [kc for kc in kanban_columns if not is_column_hidden(kc)]
+		column_pages = get_kanban_column_pages(
+			doctype,
+			rows,
+			filters,
+			column_field,
+			[kc for kc in visible_columns if not kc.get("order")],
+			order_by,
+		)
+		column_counts = get_kanban_column_counts(
+			doctype, filters, column_field, [kc.get("name") for kc in visible_columns]
+		)
+
 		for kc in kanban_columns:
-			column_filters = {column_field: kc.get("name")}
 			order = kc.get("order")
-			if (column_field in filters and filters.get(column_field) != kc.get("name")) or kc.get("delete"):
+			if is_column_hidden(kc):
 				column_data = []
 			else:
-				column_filters.update(filters.copy())
 				page_length = 20
 
 				if kc.get("page_length"):
 					page_length = kc.get("page_length")
 
 				if order:
+					column_filters = {column_field: kc.get("name")}
+					column_filters.update(filters.copy())
 					column_data = get_records_based_on_order(
 						doctype, rows, column_filters, page_length, order
 					)
 				else:
-					column_data = frappe.get_list(
-						doctype,
-						fields=rows,
-						filters=convert_filter_to_tuple(doctype, column_filters),
-						order_by=order_by,
-						page_length=page_length,
-					)
-
-				new_filters = filters.copy()
-				new_filters.update({column_field: kc.get("name")})
-
-				all_count = frappe.get_list(
-					doctype,
-					filters=convert_filter_to_tuple(doctype, new_filters),
-					fields="count(*) as total_count",
-				)[0].total_count
+					column_data = column_pages.get(kc.get("name"), [])
 
-				kc["all_count"] = all_count
+				kc["all_count"] = column_counts.get(kc.get("name"), 0)
 				kc["count"] = len(column_data)
 
-				for d in column_data:
-					getCounts(d, doctype)
-
 			if order:
 				column_data = sorted(
 					column_data,
@@ -493,67 +480,40 @@ def get_data(
 
 			data.append({"column": kc, "fields": kanban_fields, "data": column_data})
 
-	fields = frappe.get_meta(doctype).fields
-	fields = [field for field in fields if field.fieldtype not in no_value_fields]
-	fields = [
-		{
-			"label": _(field.label),
-			"fieldtype": field.fieldtype,
-			"fieldname": field.fieldname,
-			"options": field.options,
-		}
-		for field in fields
-		if field.label and field.fieldname
-	]
+		get_counts_for_docs([d for column in data for d in column["data"]], doctype)
 
-	std_fields = [
-		{"label": "Name", "fieldtype": "Data", "fieldname": "name"},
-		{"label": "Created On", "fieldtype": "Datetime", "fieldname": "creation"},
-		{"label": "Last Modified", "fieldtype": "Datetime", "fieldname": "modified"},
-		{
-			"label": "Modified By",
-			"fieldtype": "Link",
-			"fieldname": "modified_by",
-			"options": "User",
-		},
-		{"label": "Assigned To", "fieldtype": "Text", "fieldname": "_assign"},
-		{"label": "Owner", "fieldtype": "Link", "fieldname": "owner", "options": "User"},
-		{"label": "Like", "fieldtype": "Data", "fieldname": "_liked_by"},
-	]
+	view_schema = get_view_schema(doctype)
+	fields = view_schema["fields"]
 
-	for field in std_fields:
+	for field in STANDARD_FIELDS:
 		if field.get("fieldname") not in rows:
 			rows.append(field.get("fieldname"))
-		if field not in fields:
-			field["label"] = _(field["label"])
-			fields.append(field)
 
 	if not is_default and custom_view_name:
 		is_default = frappe.db.get_value("CRM View Settings", custom_view_name, "load_default_columns")
 
 	if group_by_field and view_type == "group_by":
+		groups = get_group_by_summary(doctype, convert_filter_to_tuple(doctype, filters), group_by_field)
 
 		def get_options(type, options):
 			if type == "Select":
 				return [option for option in options.split("\n")]
 			else:
-				has_empty_values = any([not d.get(group_by_field) for d in data])
-				options = list(set([d.get(group_by_field) for d in data]))
-				options = [u for u in options if u]
-				if has_empty_values:
-					options.append("")
+				options = [group.get("value") for group in groups]
 
+				# empty values sort first, as "" does among strings
+				sort_key = lambda value: (value != "", value)  # noqa: E731
 				if order_by and group_by_field in order_by:
 					order_by_fields = order_by.split(",")
 					order_by_fields = [
 						(field.split(" ")[0], field.split(" ")[1]) for field in order_by_fields
 					]
 					if (group_by_field, "asc") in order_by_fields:
-						options.sort()
+						options.sort(key=sort_key)
 					elif (group_by_field, "desc") in order_by_fields:
-						options.sort(reverse=True)
+						options.sort(key=sort_key, reverse=True)
 				else:
-					options.sort()
+					options.sort(key=sort_key)
 				return options
 
 		for field in fields:
@@ -563,13 +523,20 @@ def get_data(
 					"fieldname": field.get("fieldname"),
 					"fieldtype": field.get("fieldtype"),
 					"options": get_options(field.get("fieldtype"), field.get("options")),
+					"groups": groups,
 				}
 
-	return {
+	total_count = None
+	if count_mode == "estimated":
+		total_count = get_estimated_count(doctype, filters)
+	is_estimated_count = total_count is not None
+	if not is_estimated_count:
+		total_count = get_total_count(doctype, convert_filter_to_tuple(doctype, filters))
+
+	response = {
 		"data": data,
 		"columns": columns,
 		"rows": rows,
-		"fields": fields,
 		"column_field": column_field,
 		"title_field": title_field,
 		"kanban_columns": kanban_columns,
@@ -578,16 +545,163 @@ def get_data(
 		"page_length": page_length,
 		"page_length_count": page_length_count,
 		"is_default": is_default,
-		"views": get_views(doctype),
-		"total_count": frappe.get_list(
-			doctype, filters=filters, fields="count(*) as total_count"
-		)[0].total_count,
+		"total_count": total_count,
+		"is_estimated_count": is_estimated_count,
 		"row_count": len(data),
-		"form_script": get_form_script(doctype),
-		"list_script": get_form_script(doctype, "List"),
+		"next_cursor": next_cursor,
 		"view_type": view_type,
+		"schema_hash": view_schema["schema_hash"],
 	}
 
+	# fields, views and scripts are only sent when the client's copy is stale
+	if schema_hash != view_schema["schema_hash"]:
+		response.update(
+			{
+				"fields": fields,
+				"views": view_schema["views"],
+				"form_script": view_schema["form_script"],
+				"list_script": view_schema["list_script"],
+			}
+		)
+
+	return response
+
+
+def resolve_filters(doctype, filters, default_filters=None):
+	"""Replace `@me` placeholders and assignment filters in list view filters"""
+	filters = frappe._dict(filters)
+
+	for key in filters:
+		value = filters[key]
+		if isinstance(value, list):
+			if "@me" in value:
+				value[value.index("@me")] = frappe.session.user
+			elif "%@me%" in value:
+				index = [i for i, v in enumerate(value) if v == "%@me%"]
+				for i in index:
+					value[i] = "%" + frappe.session.user + "%"
+		elif value == "@me":
+			filters[key] = frappe.session.user
+
+	if assigned_user := get_assigned_user_filter(filters.get("_assign")):
+		if doctype in ASSIGNMENT_INDEX_DOCTYPES:
+			# resolved by `convert_filter_to_tuple` into a subquery on the assignment index
+			filters["_assign"] = ["assigned_user", assigned_user]
+		elif user_email := frappe.db.get_value("User", assigned_user, "email"):
+			# Convert to LIKE filter for JSON field
+			filters["_assign"] = ["LIKE", f"%{user_email}%"]
+
+	if default_filters:
+		default_filters = frappe.parse_json(default_filters)
+		filters.update(default_filters)
+
+	return filters
+
+
+def get_assigned_user_filter(value):
+	"""Return the user an `_assign` filter selects records for, if it selects by a single user"""
+	if not isinstance(value, list) or len(value) != 2 or not isinstance(value[1], str):
+		return None
+
+	if value[0] == "assigned_user":
+		return value[1]
+
+	if str(value[0]).lower() == "like" and value[1].startswith("%") and value[1].endswith("%"):
+		user = value[1][1:-1]
+		if user and frappe.db.exists("User", user):
+			return user
+
+	return None
+
+
+@frappe.whitelist()
+def get_data_batch(views):
+	"""
+	Get several list views, e.g. the pinned views and their count badges, in one request
+
+	Each item of `views` is either a CRM View Settings name or a dict of `get_data` arguments,
+	optionally with `name` (a saved view to start from), `key` and `count_only`.
+	The view schema is resolved once per doctype and returned under `schemas`, and
+	each view's result is returned under `results` keyed by `key` or view name.
+	"""
+	views = frappe.parse_json(views)
+	saved_views = {view.name: view for view in get_views(None)}
+
+	schemas = {}
+	results = {}
+	for index, item in enumerate(views):
+		key = get_batch_view_key(item, index)
+
+		# a view that can't be loaded only fails its own entry
+		try:
+			args = get_batch_view_args(item, saved_views)
+			args.pop("key", None)
+			count_only = cint(args.pop("count_only", 0))
+			doctype = args["doctype"]
+
+			if doctype not in schemas:
+				schemas[doctype] = get_view_schema(doctype)
+
+			if count_only:
+				filters = resolve_filters(doctype, args.get("filters") or {}, args.get("default_filters"))
+				results[key] = {"total_count": get_total_count(doctype, convert_filter_to_tuple(doctype, filters))}
+			else:
+				results[key] = get_data(**args, schema_hash=schemas[doctype]["schema_hash"])
+		except frappe.PermissionError:
+			frappe.clear_last_message()
+			results[key] = {"error": _("Not permitted")}
+		except frappe.ValidationError as e:
+			frappe.clear_last_message()
+			results[key] = {"error": str(e)}
+
+	return {"schemas": schemas, "results": results}
+
+
+def get_batch_view_key(item, index):
+	"""Key of an item of `get_data_batch` in its results"""
+	if isinstance(item, str):
+		return item
+	item = frappe._dict(item)
+	return item.key or item.name or (item.view or {}).get("custom_view_name") or str(index)
+
+
+def get_batch_view_args(item, saved_views):
+	"""Build `get_data` arguments for an item of `get_data_batch`"""
+	if isinstance(item, str):
+		item = {"name": item}
+	item = frappe._dict(item)
+
+	args = {}
+	if item.name:
+		view = saved_views.get(item.name)
+		if not view:
+			frappe.throw(_("View {0} not found").format(item.name), frappe.DoesNotExistError)
+
+		args = {
+			"key": view.name,
+			"doctype": view.dt,
+			"filters": frappe.parse_json(view.filters or "{}"),
+			"order_by": view.order_by or "modified desc",
+			"columns": view.columns,
+			"rows": view.rows,
+			"column_field": view.column_field,
+			"title_field": view.title_field,
+			"kanban_columns": view.kanban_columns,
+			"kanban_fields": view.kanban_fields,
+			"view": {
+				"custom_view_name": view.name,
+				"view_type": view.type,
+				"group_by_field": view.group_by_field,
+			},
+		}
+
+	args.update({key: value for key, value in item.items() if key != "name"})
+	if not args.get("doctype"):
+		frappe.throw(_("Doctype is required for view {0}").format(item.get("key") or ""))
+	args.setdefault("filters", {})
+	args.setdefault("order_by", "modified desc")
+	return args
+
 
 def parse_list_data(data, doctype):
 	_list = get_controller(doctype)
@@ -601,10 +715,291 @@ def convert_filter_to_tuple(doctype, filters):
 		filters_items = filters.items()
 		filters = []
 		for key, value in filters_items:
-			filters.append(make_filter_tuple(doctype, key, value))
+			if key == "_assign" and doctype in ASSIGNMENT_INDEX_DOCTYPES and is_assigned_user_filter(value):
+				# look up assigned records in the assignment index instead of scanning `_assign`
+				filters.append(get_assigned_condition(doctype, value[1]))
+			else:
+				filters.append(make_filter_tuple(doctype, key, value))
 	return filters
 
 
+def is_assigned_user_filter(value):
+	return isinstance(value, list | tuple) and len(value) == 2 and value[0] == "assigned_user"
+
+
+def get_kanban_column_pages(doctype, rows, filters, column_field, kanban_columns, order_by):
+	"""Fetch the first page of every kanban column in a single query.
+
+	Rows are ranked with ROW_NUMBER() partitioned by `column_field` over the permission-filtered
+	list query, so the number of round trips does not grow with the number of columns.
+	Returns {column name: [rows]} trimmed to each column's `page_length`.
+	"""
+	if not kanban_columns:
+		return {}
+
+	# the column field is written into the window query, so only accept real fields of the doctype
+	if not frappe.get_meta(doctype).has_field(column_field):
+		frappe.throw(_("Invalid kanban column field {0}").format(column_field))
+
+	page_lengths = {kc.get("name"): cint(kc.get("page_length")) or 20 for kc in kanban_columns}
+	window_order = parse_order_by(order_by)
+
+	fields = list(dict.fromkeys([*rows, column_field, *[fieldname for fieldname, direction in window_order]]))
+	column_filters = filters.copy()
+	column_filters[column_field] = ("in", list(page_lengths))
+
+	list_query = frappe.get_list(
+		doctype,
+		fields=fields,
+		filters=convert_filter_to_tuple(doctype, column_filters),
+		order_by=order_by,
+		page_length=0,
+		run=0,
+	)
+
+	order_sql = ", ".join(f"`t`.`{fieldname}` {direction}" for fieldname, direction in window_order)
+	records = frappe.db.sql(
+		f"""
+		select * from (
+			select `t`.*, row_number() over (
+				partition by `t`.`{column_field}` order by {order_sql}
+			) as `_kanban_row`
+			from ({list_query}) `t`
+		) `ranked`
+		where `_kanban_row` <= {max(page_lengths.values())}
+		order by `_kanban_row`
+		""",
+		as_dict=True,
+	)
+
+	column_pages = {name: [] for name in page_lengths}
+	for record in records:
+		row_number = record.pop("_kanban_row")
+		column = record.get(column_field)
+		if column in column_pages and row_number <= page_lengths[column]:
+			column_pages[column].append(record)
+	return column_pages
+
+
+def get_kanban_column_counts(doctype, filters, column_field, column_names):
+	"""Return {column name: total_count} for all kanban columns with one GROUP BY query"""
+	if not column_names:
+		return {}
+
+	count_filters = filters.copy()
+	count_filters[column_field] = ("in", column_names)
+
+	counts = frappe.get_list(
+		doctype,
+		filters=convert_filter_to_tuple(doctype, count_filters),
+		fields=[column_field, "count(*) as total_count"],
+		group_by=column_field,
+		page_length=0,
+		as_list=True,
+	)
+	return {column: total_count for column, total_count in counts}
+
+
+def parse_order_by(order_by):
+	"""Convert a list view `order_by` into (fieldname, direction) pairs without table qualifiers"""
+	window_order = []
+	for part in (order_by or "modified desc").split(","):
+		# the direction is split off the end as table qualifiers like `tabCRM Lead` contain spaces
+		column, __, direction = part.strip().rpartition(" ")
+		if direction.lower() not in ("asc", "desc"):
+			column, direction = part, ""
+		fieldname = column.strip().split(".")[-1].strip("`")
+		if not fieldname.replace("_", "").isalnum():
+			continue
+		direction = "desc" if direction.strip().lower() == "desc" else "asc"
+		window_order.append((fieldname, direction))
+	return window_order or [("modified", "desc")]
+
+
+def get_list_page(doctype, rows, filters, order_by, page_length, cursor=None):
+	"""Fetch one page of a list view, resuming after `cursor`. Returns (data, next_cursor)"""
+	order_by = order_by or "modified desc"
+	# order by the sort columns with `name` as tie-breaker so pages can be resumed from a cursor
+	keyset_order = get_keyset_order(doctype, order_by)
+	if keyset_order:
+		for fieldname, __ in keyset_order:
+			if fieldname not in rows:
+				rows.append(fieldname)
+		order_by = ", ".join(f"`tab{doctype}`.`{fieldname}` {direction}" for fieldname, direction in keyset_order)
+
+	list_filters, start, offset = get_cursor_filters(doctype, filters, keyset_order, cursor)
+	data = (
+		frappe.get_list(
+			doctype,
+			fields=rows,
+			filters=list_filters,
+			order_by=order_by,
+			start=start,
+			page_length=page_length,
+		)
+		or []
+	)
+	next_cursor = get_next_cursor(data, keyset_order, offset, page_length)
+	return parse_list_data(data, doctype), next_cursor
+
+
+def get_group_by_summary(doctype, filters, group_by_field):
+	"""
+	Get every group of a group by view with one GROUP BY query
+
+	Returns a list of {"value", "count"} plus the sum of each of GROUP_BY_SUM_FIELDS present
+	on `doctype`. Empty and unset values are merged into the "" group.
+	"""
+	meta = frappe.get_meta(doctype)
+	sum_fields = [fieldname for fieldname in GROUP_BY_SUM_FIELDS if meta.has_field(fieldname)]
+
+	rows = frappe.get_list(
+		doctype,
+		filters=filters,
+		fields=[
+			group_by_field,
+			"count(*) as count",
+			*[f"sum({fieldname}) as {fieldname}" for fieldname in sum_fields],
+		],
+		group_by=group_by_field,
+		order_by="count desc",
+		page_length=0,
+	)
+
+	groups = {}
+	for row in rows:
+		value = row.get(group_by_field) or ""
+		group = groups.setdefault(value, {"value": value, "count": 0, **dict.fromkeys(sum_fields, 0)})
+		group["count"] += row.count
+		for fieldname in sum_fields:
+			group[fieldname] += flt(row.get(fieldname))
+	return list(groups.values())
+
+
+@frappe.whitelist()
+def get_group_by_data(
+	doctype: str,
+	filters: dict,
+	group_by_field: str,
+	group_value=None,
+	order_by="modified desc",
+	rows=None,
+	page_length=20,
+	cursor=None,
+):
+	"""Get a page of the rows of a single group of a group by view"""
+	filters = resolve_filters(doctype, filters)
+	filters[group_by_field] = group_value if group_value else ("is", "not set")
+
+	rows = frappe.parse_json(rows or "[]")
+	if not rows:
+		_list = get_controller(doctype)
+		rows = _list.default_list_data().get("rows") if hasattr(_list, "default_list_data") else ["name"]
+	if group_by_field not in rows:
+		rows.append(group_by_field)
+
+	data, next_cursor = get_list_page(doctype, rows, filters, order_by, page_length, cursor)
+	return {"data": data, "next_cursor": next_cursor}
+
+
+def get_keyset_order(doctype, order_by):
+	"""
+	(fieldname, direction) pairs of `order_by` ending with `name`
+
+	Returns None if it sorts on anything but columns of `doctype`, as such pages can't be sought.
+	"""
+	meta = frappe.get_meta(doctype)
+	keyset_order = []
+	for fieldname, direction in parse_order_by(order_by):
+		df = meta.get_field(fieldname)
+		if fieldname not in default_fields and (
+			not df or df.fieldtype in no_value_fields or df.get("is_virtual")
+		):
+			return None
+		keyset_order.append((fieldname, direction))
+		if fieldname == "name":
+			return keyset_order
+
+	return [*keyset_order, ("name", keyset_order[-1][1])]
+
+
+def get_cursor_filters(doctype, filters, keyset_order, cursor):
+	"""
+	Translate a list view cursor into get_list arguments
+
+	The page is located with a seek condition on the sort columns and `name`, so every page
+	costs the same. Cursors of sorts that can't be sought fall back to their absolute offset.
+
+	:return: (filters, start, offset) where `offset` is the number of rows before the page
+	"""
+	filters = convert_filter_to_tuple(doctype, filters)
+	if not cursor:
+		return filters, 0, 0
+
+	cursor = decode_cursor(cursor)
+	offset = cint(cursor.get("start"))
+	values = cursor.get("values")
+	if not keyset_order or not isinstance(values, list) or len(values) != len(keyset_order):
+		return filters, offset, offset
+
+	return [*filters, get_seek_condition(doctype, keyset_order, values)], 0, offset
+
+
+def get_seek_condition(doctype, keyset_order, values):
+	"""
+	SQL condition selecting the rows sorted after `values` in `keyset_order`
+
+	Expands to (c1 after v1) or (c1 = v1 and c2 after v2) or ..., with empty values placed where
+	the database sorts them: first in ascending order on MariaDB, last on Postgres.
+	"""
+	nulls_first = frappe.db.db_type != "postgres"
+	conditions = []
+	equal_conditions = []
+	for (fieldname, direction), value in zip(keyset_order, values, strict=True):
+		column = f"`tab{doctype}`.`{fieldname}`"
+		# whether empty values come before all others in this column's order
+		nulls_lead = nulls_first == (direction == "asc")
+
+		if value is None:
+			after = f"{column} is not null" if nulls_lead else None
+		else:
+			operator = "<" if direction == "desc" else ">"
+			after = f"{column} {operator} {frappe.db.escape(value, percent=False)}"
+			if not nulls_lead:
+				after = f"({after} or {column} is null)"
+
+		if after:
+			conditions.append(" and ".join([*equal_conditions, after]))
+		if value is None:
+			equal_conditions.append(f"{column} is null")
+		else:
+			equal_conditions.append(f"{column} = {frappe.db.escape(value, percent=False)}")
+
+	return "(" + " or ".join(f"({condition})" for condition in conditions) + ")"
+
+
+def get_next_cursor(data, keyset_order, offset, page_length):
+	"""Build the cursor for the page after `data`, or None if this was the last page"""
+	if not data or len(data) < cint(page_length):
+		return None
+
+	cursor = {"start": offset + len(data)}
+	if keyset_order:
+		cursor["values"] = [data[-1].get(fieldname) for fieldname, __ in keyset_order]
+	return encode_cursor(cursor)
+
+
+def encode_cursor(cursor):
+	return base64.urlsafe_b64encode(json.dumps(cursor, default=str).encode()).decode()
+
+
+def decode_cursor(cursor):
+	try:
+		return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+	except (ValueError, TypeError):
+		frappe.throw(_("Invalid cursor"))
+
+
 def get_records_based_on_order(doctype, rows, filters, page_length, order):
 	records = []
 	filters = convert_filter_to_tuple(doctype, filters)
@@ -707,7 +1102,7 @@ def remove_assignments(doctype, name, assignees, ignore_permissions=False, retry
 				break  # Break inner loop if successful
 			except Exception as e:
 				error_message = str(e)
-				is_deadlock = "Deadlock found when trying to get lock" in error_message
+				is_deadlock = frappe.db.is_deadlocked(e)
 
 				if is_deadlock and attempt < retry_count - 1:
 					frappe.log_error(_("Deadlock detected in unassignment, retrying... (Attempt {0}/{1})").format(attempt + 1, retry_count))
@@ -758,36 +1153,53 @@ def get_fields(doctype: str, allow_all_fieldtypes: bool = False):
 
 
 def getCounts(d, doctype):
-	d["_email_count"] = (
-		frappe.db.count(
-			"Communication",
-			filters={
-				"reference_doctype": doctype,
-				"reference_name": d.get("name"),
-				"communication_type": "Communication",
-			},
-		)
-		or 0
-	)
-	d["_email_count"] = d["_email_count"] + frappe.db.count(
+	return get_counts_for_docs([d], doctype)[0]
+
+
+def get_counts_for_docs(docs, doctype):
+	"""Set email, comment, task and note counts on all docs with one grouped query per source table"""
+	names = list({d.get("name") for d in docs if d.get("name")})
+	if not names:
+		return docs
+
+	email_counts = get_grouped_counts(
 		"Communication",
-		filters={
+		"reference_name",
+		names,
+		{
 			"reference_doctype": doctype,
-			"reference_name": d.get("name"),
-			"communication_type": "Automated Message",
+			"communication_type": ("in", ["Communication", "Automated Message"]),
 		},
 	)
-	d["_comment_count"] = frappe.db.count(
+	comment_counts = get_grouped_counts(
 		"Comment",
-		filters={"reference_doctype": doctype, "reference_name": d.get("name"), "comment_type": "Comment"},
-	)
-	d["_task_count"] = frappe.db.count(
-		"CRM Task", filters={"reference_doctype": doctype, "reference_docname": d.get("name")}
+		"reference_name",
+		names,
+		{"reference_doctype": doctype, "comment_type": "Comment"},
 	)
-	d["_note_count"] = frappe.db.count(
-		"FCRM Note", filters={"reference_doctype": doctype, "reference_docname": d.get("name")}
+	task_counts = get_grouped_counts("CRM Task", "reference_docname", names, {"reference_doctype": doctype})
+	note_counts = get_grouped_counts("FCRM Note", "reference_docname", names, {"reference_doctype": doctype})
+
+	for d in docs:
+		name = d.get("name")
+		d["_email_count"] = email_counts.get(name, 0)
+		d["_comment_count"] = comment_counts.get(name, 0)
+		d["_task_count"] = task_counts.get(name, 0)
+		d["_note_count"] = note_counts.get(name, 0)
+	return docs
+
+
+def get_grouped_counts(doctype, link_field, names, filters):
+	"""Return {link_field value: count} for rows of doctype linked to any of names"""
+	filters = {**filters, link_field: ("in", names)}
+	counts = frappe.get_all(
+		doctype,
+		filters=filters,
+		fields=[link_field, "count(*) as count"],
+		group_by=link_field,
+		as_list=True,
 	)
-	return d
+	return {name: count for name, count in counts}
 
 
 def get_changed_fields(doc):
@@ -831,9 +1243,20 @@ def unsubscribe_doc(doctype, name):
 def on_doc_update(doc, method=None):
 	"""Publish updates to subscribed clients"""
 	# Handle CRM Lead, CRM Deal and CRM Task
-	if doc.doctype not in ['CRM Lead', 'CRM Deal', 'CRM Task']:
+	if doc.doctype not in COUNT_CACHE_DOCTYPES:
 		return
-		
+
+	if method == "on_trash":
+		log_deletion(doc)
+
+	# Bulk updates publish one event per chunk, see crm.api.bulk_update
+	if bulk_update := frappe.flags.crm_bulk_update:
+		bulk_update.names.append(doc.name)
+		return
+
+	# Drop cached list counts once the change is visible to other sessions
+	frappe.db.after_commit.add(lambda: clear_count_cache(doc.doctype))
+
 	# Determine event type based on method
 	event = 'modified'
 	if method == 'after_insert':
@@ -853,29 +1276,103 @@ def on_doc_update(doc, method=None):
 		},
 		after_commit=True
 	)
+@frappe.whitelist()
+def get_data_delta(view, since_modified, known_names=None):
+	"""
+	Get the changes to a list view since `since_modified`
+
+	`view` is either a CRM View Settings name or a dict with `doctype`, `filters`, `rows`
+	and optionally `default_filters`. `known_names` are the records the client currently shows.
+
+	Returns rows modified since `since_modified` that match the view's filters and permissions,
+	names of known rows that were deleted or no longer match, and the server time to use as
+	`since_modified` on the next call. When more than DELTA_ROW_LIMIT rows changed, only
+	`full_reload` is set and the client reloads the view instead.
+	"""
+	server_time = frappe.utils.now()
+	view = get_delta_view(view)
+	doctype = view.doctype
+	known_names = frappe.parse_json(known_names or "[]")
+
+	filters = resolve_filters(doctype, view.filters, view.default_filters)
+	list_filters = convert_filter_to_tuple(doctype, filters)
+
+	rows = list(view.rows or [])
+	if not rows:
+		_list = get_controller(doctype)
+		rows = _list.default_list_data().get("rows") if hasattr(_list, "default_list_data") else ["name"]
+	if "name" not in rows:
+		rows.append("name")
+
+	modified = frappe.get_list(
+		doctype,
+		fields=rows,
+		filters=[*list_filters, [doctype, "modified", ">", since_modified]],
+		page_length=DELTA_ROW_LIMIT + 1,
+	)
+	if len(modified) > DELTA_ROW_LIMIT:
+		return {"data": [], "removed": [], "full_reload": True, "server_time": server_time}
+	modified_names = {d.name for d in modified}
+
+	removed = set()
+	if known_names:
+		removed.update(get_deleted_names(doctype, since_modified, known_names))
+
+		# known rows changed since the last refresh that dropped out of the view
+		changed = frappe.get_list(
+			doctype,
+			filters={"name": ("in", known_names), "modified": (">", since_modified)},
+			pluck="name",
+			page_length=0,
+		)
+		removed.update(name for name in changed if name not in modified_names)
+
+	return {
+		"data": parse_list_data(modified, doctype),
+		"removed": list(removed),
+		"full_reload": False,
+		"server_time": server_time,
+	}
+
+
+def get_delta_view(view):
+	view = frappe.parse_json(view)
+	if isinstance(view, str):
+		view_settings = frappe.get_doc("CRM View Settings", view)
+		view_settings.check_permission("read")
+		view = {
+			"doctype": view_settings.dt,
+			"filters": view_settings.filters,
+			"rows": view_settings.rows,
+		}
+
+	view = frappe._dict(view)
+	view.filters = frappe.parse_json(view.filters or "{}")
+	view.rows = frappe.parse_json(view.rows or "[]")
+	return view
+
+
 @frappe.whitelist()
 def get_linked_docs_of_document(doctype, docname):
-	doc = frappe.get_doc(doctype, docname)
-	linked_docs = get_linked_docs(doc)
-	dynamic_linked_docs = get_dynamic_linked_docs(doc)
+	frappe.has_permission(doctype, "read", docname, throw=True)
 
-	linked_docs.extend(dynamic_linked_docs)
+	linked_docs = get_linked_docs_for_names(doctype, [docname])
 	linked_docs = list({doc["reference_docname"]: doc for doc in linked_docs}.values())
 
-	docs_data = []
+	docnames_by_doctype = {}
 	for doc in linked_docs:
-		data = frappe.get_doc(doc["reference_doctype"], doc["reference_docname"])
-		title = data.get("title")
-		if data.doctype == "CRM Call Log":
-			title = f"Call from {data.get('from')} to {data.get('to')}"
+		docnames_by_doctype.setdefault(doc["reference_doctype"], []).append(doc["reference_docname"])
 
-		if data.doctype == "CRM Deal":
-			title = data.get("organization")
+	titles = {}
+	for linked_doctype, docnames in docnames_by_doctype.items():
+		titles[linked_doctype] = get_linked_doc_titles(linked_doctype, docnames)
 
+	docs_data = []
+	for doc in linked_docs:
 		docs_data.append(
 			{
-				"doc": data.doctype,
-				"title": title or data.get("name"),
+				"doc": doc["reference_doctype"],
+				"title": titles[doc["reference_doctype"]].get(doc["reference_docname"]) or doc["reference_docname"],
 				"reference_docname": doc["reference_docname"],
 				"reference_doctype": doc["reference_doctype"],
 			}
@@ -883,6 +1380,28 @@ def get_linked_docs_of_document(doctype, docname):
 	return docs_data
 
 
+def get_linked_doc_titles(doctype, docnames):
+	"""Return {name: title} of `docnames` reading only the fields the title is made of"""
+	meta = frappe.get_meta(doctype)
+	fields = ["name"]
+	if doctype == "CRM Call Log":
+		fields += ["from", "to"]
+	elif doctype == "CRM Deal":
+		fields.append("organization")
+	elif meta.has_field("title"):
+		fields.append("title")
+
+	titles = {}
+	for row in frappe.get_all(doctype, filters={"name": ("in", docnames)}, fields=fields):
+		if doctype == "CRM Call Log":
+			titles[row.name] = f"Call from {row.get('from')} to {row.get('to')}"
+		elif doctype == "CRM Deal":
+			titles[row.name] = row.organization
+		else:
+			titles[row.name] = row.get("title")
+	return titles
+
+
 def remove_doc_link(doctype, docname):
 	linked_doc_data = frappe.get_doc(doctype, docname)
 	linked_doc_data.update(
@@ -924,54 +1443,120 @@ def remove_linked_doc_reference(items, remove_contact=None, delete=False):
 
 @frappe.whitelist()
 def delete_bulk_docs(doctype, items, delete_linked=False):
-	from frappe.desk.reportview import delete_bulk
-
 	try:
 		items = frappe.parse_json(items)
-		
-		# Process linked documents for each item
-		for doc in items:
-			try:
-				linked_docs = get_linked_docs_of_document(doctype, doc)
-				
-				# If there are linked documents, handle them according to delete_linked flag
-				for linked_doc in linked_docs:
-					try:
-						remove_linked_doc_reference(
-							[
-								{
-									"doctype": linked_doc["reference_doctype"],
-									"docname": linked_doc["reference_docname"],
-								}
-							],
-							remove_contact=doctype == "Contact",
-							delete=delete_linked,
-						)
-					except Exception as e:
-						frappe.log_error(f"Error handling linked doc {linked_doc['reference_docname']}: {str(e)}")
-						# Continue with other linked documents
-						continue
-			except Exception as e:
-				frappe.log_error(f"Error processing linked documents for {doc}: {str(e)}")
-				# Continue with other documents
-				continue
+		frappe.has_permission(doctype, "delete", throw=True)
+
+		if len(items) > 10:
+			frappe.enqueue(
+				delete_docs_with_links,
+				queue="long",
+				doctype=doctype,
+				items=items,
+				delete_linked=delete_linked,
+			)
+		else:
+			delete_docs_with_links(doctype, items, delete_linked)
 
-		# Delete the main documents
-		try:
-			if len(items) > 10:
-				frappe.enqueue("frappe.desk.reportview.delete_bulk", doctype=doctype, items=items)
-			else:
-				delete_bulk(doctype, items)
-		except Exception as e:
-			frappe.log_error(f"Error in bulk delete: {str(e)}")
-			raise
-			
 		return "success"
 	except Exception as e:
 		frappe.log_error(f"Error in delete_bulk_docs: {str(e)}")
 		frappe.throw(f"Error in bulk delete operation: {str(e)}")
 
 
+def delete_docs_with_links(doctype, items, delete_linked=False):
+	"""
+	Unlink (or delete) the documents linked to `items` and delete `items`
+
+	Links are discovered with grouped IN queries and cleared with set-based updates
+	per chunk of items, then the items are deleted with frappe's `delete_bulk`,
+	which reports progress and failures per item.
+	"""
+	from frappe.desk.reportview import delete_bulk
+
+	delete_linked = cint(delete_linked)
+	processed = 0
+	for chunk in create_batch(items, BULK_DELETE_CHUNK_SIZE):
+		try:
+			linked_docs = get_linked_docs_for_names(doctype, chunk)
+			linked_docs = list({doc["reference_docname"]: doc for doc in linked_docs}.values())
+			unlink_docs(linked_docs, remove_contact=doctype == "Contact", delete=delete_linked)
+		except Exception as e:
+			frappe.log_error(f"Error processing linked documents for {', '.join(chunk)}: {str(e)}")
+
+		processed += len(chunk)
+		frappe.publish_realtime(
+			"progress",
+			{
+				"progress": [processed, len(items)],
+				"title": _("Unlinking documents linked to {0}").format(_(doctype)),
+			},
+			user=frappe.session.user,
+		)
+
+	try:
+		delete_bulk(doctype, items)
+	except Exception as e:
+		frappe.log_error(f"Error in bulk delete: {str(e)}")
+		raise
+
+
+def unlink_docs(linked_docs, remove_contact=False, delete=False):
+	"""Clear the references of `linked_docs` with one UPDATE per linked doctype"""
+	docnames_by_doctype = {}
+	for linked_doc in linked_docs:
+		docnames_by_doctype.setdefault(linked_doc["reference_doctype"], []).append(
+			linked_doc["reference_docname"]
+		)
+
+	for linked_doctype, docnames in docnames_by_doctype.items():
+		try:
+			if remove_contact:
+				remove_contact_links(linked_doctype, docnames)
+			else:
+				universal_remove_doc_links(linked_doctype, docnames)
+		except Exception as e:
+			frappe.log_error(f"Error handling linked docs of {linked_doctype}: {str(e)}")
+			continue
+
+		if delete:
+			for docname in docnames:
+				try:
+					frappe.delete_doc(linked_doctype, docname)
+				except Exception as e:
+					frappe.log_error(f"Error handling linked doc {docname}: {str(e)}")
+
+
+def remove_contact_links(doctype, docnames):
+	"""Set-based version of `remove_contact_link`"""
+	meta = frappe.get_meta(doctype)
+	if meta.has_field("contact"):
+		frappe.db.set_value(doctype, {"name": ("in", docnames)}, "contact", None)
+
+	if (contacts_field := meta.get_field("contacts")) and contacts_field.fieldtype == "Table":
+		frappe.db.delete(
+			contacts_field.options,
+			{"parenttype": doctype, "parentfield": "contacts", "parent": ("in", docnames)},
+		)
+
+
+def universal_remove_doc_links(doctype, docnames):
+	"""Set-based version of `universal_remove_doc_link`"""
+	fields = get_reference_fields(doctype)
+	if fields:
+		frappe.db.set_value(doctype, {"name": ("in", docnames)}, dict.fromkeys(fields))
+
+
+def get_reference_fields(doctype):
+	"""Link fields to DocType and the Dynamic Link fields that use them as options"""
+	meta = frappe.get_meta(doctype)
+	link_fields = [f.fieldname for f in meta.fields if f.fieldtype == "Link" and f.options == "DocType"]
+	dynlink_fields = [
+		f.fieldname for f in meta.fields if f.fieldtype == "Dynamic Link" and f.options in link_fields
+	]
+	return link_fields + dynlink_fields
+
+
 # --- UNIVERSAL UNLINK FUNCTION FOR FORK SUPPORT ---
 def universal_remove_doc_link(doctype, docname):
     """
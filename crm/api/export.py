@@ -0,0 +1,159 @@
+import csv
+import json
+
+import frappe
+from frappe import _
+from frappe.model.document import get_controller
+from frappe.utils import cint
+
+from crm.api.count_cache import count_records
+from crm.api.doc import convert_filter_to_tuple, get_list_page, resolve_filters
+
+EXPORT_CHUNK_SIZE = 1000
+
+
+@frappe.whitelist()
+def export_view(doctype=None, filters=None, columns=None, order_by=None, view=None, file_format="CSV"):
+	"""
+	Export every row of a list view to a CSV or Excel file in the background
+
+	Pass either a saved CRM View Settings name as `view` or `doctype`, `filters`, `columns`
+	and `order_by` as sent to `crm.api.doc.get_data`. Progress is published to the user as
+	`crm_export_progress` events carrying the returned `export_id`; the last event has the file url.
+	"""
+	if file_format not in ("CSV", "Excel"):
+		frappe.throw(_("Unsupported export format: {0}").format(file_format))
+
+	if view:
+		view_settings = frappe.get_doc("CRM View Settings", view)
+		view_settings.check_permission("read")
+		doctype = view_settings.dt
+		filters = view_settings.filters
+		columns = view_settings.columns
+		order_by = view_settings.order_by
+
+	frappe.has_permission(doctype, "export", throw=True)
+
+	columns = frappe.parse_json(columns or "[]")
+	if not columns:
+		_list = get_controller(doctype)
+		if hasattr(_list, "default_list_data"):
+			columns = _list.default_list_data().get("columns")
+		else:
+			columns = [{"label": _("Name"), "key": "name"}]
+
+	export_id = frappe.generate_hash(length=10)
+	frappe.enqueue(
+		build_export,
+		queue="long",
+		timeout=6 * 60 * 60,
+		export_id=export_id,
+		doctype=doctype,
+		filters=frappe.parse_json(filters or "{}"),
+		columns=columns,
+		order_by=order_by or "modified desc",
+		file_format=file_format,
+	)
+	return export_id
+
+
+def build_export(export_id, doctype, filters, columns, order_by, file_format="CSV"):
+	"""Write the view to a private file chunk by chunk, so memory use does not depend on row count"""
+	filters = resolve_filters(doctype, filters)
+	keys = [column.get("key") for column in columns]
+	rows = list(dict.fromkeys(["name", *keys]))
+
+	extension = "csv" if file_format == "CSV" else "xlsx"
+	file_name = f"{frappe.scrub(doctype)}-{export_id}.{extension}"
+	file_path = frappe.get_site_path("private", "files", file_name)
+
+	total_count = count_records(doctype, convert_filter_to_tuple(doctype, filters))
+	writer = get_export_writer(file_path, file_format)
+	writer.write([_(column.get("label")) for column in columns])
+
+	exported = 0
+	cursor = None
+	try:
+		while True:
+			# chunks are sought on the full sort key, so every chunk costs the same
+			data, next_cursor = get_list_page(
+				doctype, list(rows), filters, order_by, EXPORT_CHUNK_SIZE, cursor
+			)
+			for row in data:
+				writer.write([format_export_value(row.get(key)) for key in keys])
+
+			exported += len(data)
+			publish_export_progress(export_id, exported, total_count)
+			if not next_cursor:
+				break
+			if next_cursor == cursor:
+				frappe.throw(_("Export of {0} stopped as its pages did not advance").format(_(doctype)))
+			cursor = next_cursor
+	finally:
+		writer.close()
+
+	_file = frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": file_name,
+			"file_url": f"/private/files/{file_name}",
+			"is_private": 1,
+		}
+	).insert(ignore_permissions=True)
+
+	publish_export_progress(export_id, exported, total_count, file_url=_file.file_url)
+
+
+def get_export_writer(file_path, file_format):
+	if file_format == "CSV":
+		return CSVExportWriter(file_path)
+	return ExcelExportWriter(file_path)
+
+
+class CSVExportWriter:
+	def __init__(self, file_path):
+		self.file = open(file_path, "w", newline="", encoding="utf-8")
+		self.writer = csv.writer(self.file)
+
+	def write(self, row):
+		self.writer.writerow(row)
+
+	def close(self):
+		self.file.close()
+
+
+class ExcelExportWriter:
+	def __init__(self, file_path):
+		from openpyxl import Workbook
+
+		self.file_path = file_path
+		# write only workbooks stream rows to disk instead of keeping them in memory
+		self.workbook = Workbook(write_only=True)
+		self.sheet = self.workbook.create_sheet()
+
+	def write(self, row):
+		self.sheet.append(row)
+
+	def close(self):
+		self.workbook.save(self.file_path)
+		self.workbook.close()
+
+
+def format_export_value(value):
+	if isinstance(value, dict | list):
+		return json.dumps(value, default=str)
+	return value
+
+
+def publish_export_progress(export_id, exported, total_count, file_url=None):
+	frappe.publish_realtime(
+		"crm_export_progress",
+		{
+			"export_id": export_id,
+			"exported": exported,
+			"total": total_count,
+			"progress": cint(exported * 100 / total_count) if total_count else 100,
+			"file_url": file_url,
+		},
+		user=frappe.session.user,
+	)
@@ -0,0 +1,72 @@
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from crm.api.doc import decode_cursor, get_list_page, get_next_cursor, parse_order_by
+
+# Organizations of the leads paged through, with empty values and ties on `name`
+ORGANIZATIONS = [None, "", "Acme", "Acme", "Globex", None, "", "Acme"]
+
+
+class UnitTestListCursor(UnitTestCase):
+	def test_parse_order_by(self):
+		self.assertEqual(parse_order_by("`tabCRM Lead`.`modified` desc"), [("modified", "desc")])
+		self.assertEqual(
+			parse_order_by("`tabCRM Lead`.status asc, name DESC"), [("status", "asc"), ("name", "desc")]
+		)
+		self.assertEqual(parse_order_by("creation"), [("creation", "asc")])
+		self.assertEqual(parse_order_by(""), [("modified", "desc")])
+
+	def test_next_cursor(self):
+		keyset_order = [("organization", "asc"), ("name", "asc")]
+		data = [frappe._dict(organization="Acme", name="a"), frappe._dict(organization=None, name="b")]
+
+		cursor = decode_cursor(get_next_cursor(data, keyset_order, 4, 2))
+		self.assertEqual(cursor, {"start": 6, "values": [None, "b"]})
+
+		data[-1].organization = ""
+		self.assertEqual(decode_cursor(get_next_cursor(data, keyset_order, 0, 2))["values"], ["", "b"])
+		self.assertEqual(decode_cursor(get_next_cursor(data, None, 0, 2)), {"start": 2})
+
+		self.assertIsNone(get_next_cursor(data, keyset_order, 0, 3))
+		self.assertIsNone(get_next_cursor([], keyset_order, 0, 2))
+
+
+class IntegrationTestListCursor(IntegrationTestCase):
+	def setUp(self):
+		self.last_name = frappe.generate_hash(length=10)
+		for organization in ORGANIZATIONS:
+			lead = frappe.get_doc(
+				{"doctype": "CRM Lead", "first_name": "Cursor", "last_name": self.last_name}
+			)
+			lead.insert(ignore_permissions=True)
+			frappe.db.set_value("CRM Lead", lead.name, "organization", organization, update_modified=False)
+
+	def test_empty_values_and_ties(self):
+		# rows with equal organizations are only told apart by `name`
+		for direction in ["asc", "desc"]:
+			for order_by in [f"organization {direction}", f"`tabCRM Lead`.`organization` {direction}"]:
+				with self.subTest(order_by=order_by):
+					expected = frappe.get_all(
+						"CRM Lead",
+						filters={"last_name": self.last_name},
+						order_by=f"organization {direction}, name {direction}",
+						pluck="name",
+					)
+					self.assertEqual(self.get_paged_names(order_by, page_length=3), expected)
+
+	def test_name_order(self):
+		expected = frappe.get_all(
+			"CRM Lead", filters={"last_name": self.last_name}, order_by="name desc", pluck="name"
+		)
+		self.assertEqual(self.get_paged_names("name desc", page_length=2), expected)
+
+	def get_paged_names(self, order_by, page_length):
+		names = []
+		cursor = None
+		while True:
+			data, cursor = get_list_page(
+				"CRM Lead", ["name"], {"last_name": self.last_name}, order_by, page_length, cursor
+			)
+			names += [row["name"] for row in data]
+			if not cursor:
+				return names
@@ -0,0 +1,390 @@
+import heapq
+
+import frappe
+from frappe import _
+from frappe.query_builder import Criterion, Order
+from frappe.utils import cint, get_datetime
+
+from crm.api.activities import (
+	CALL_LOG_FIELDS,
+	NOTE_FIELDS,
+	TASK_FIELDS,
+	get_attachment_log_activity,
+	get_comment_activity,
+	get_communication_columns,
+	get_communication_query,
+	get_version_activities,
+	is_version_activity,
+	load_attachments,
+)
+from crm.api.doc import decode_cursor, encode_cursor
+from crm.fcrm.doctype.crm_activity.crm_activity import FEED_DOCTYPES
+from crm.fcrm.doctype.crm_call_log.crm_call_log import parse_call_logs
+from crm.utils.communications import prepare_communication_activity
+
+TIMELINE_ACTIVITY_TYPES = ["creation", "version", "comment", "attachment_log", "communication"]
+
+# Fields read from the source of each kind of CRM Activity row
+FEED_SOURCE_FIELDS = {
+	"CRM Lead": ["name", "creation", "owner"],
+	"CRM Deal": ["name", "creation", "owner", "lead"],
+	"Version": ["name", "creation", "owner", "data", "ref_doctype", "docname"],
+	"Comment": ["name", "creation", "owner", "content", "comment_type"],
+	"File": [
+		"name",
+		"file_name",
+		"file_type",
+		"file_url",
+		"file_size",
+		"is_private",
+		"modified",
+		"creation",
+		"owner",
+	],
+	"CRM Call Log": CALL_LOG_FIELDS,
+	"FCRM Note": [*NOTE_FIELDS, "creation"],
+	"CRM Task": [*TASK_FIELDS, "creation"],
+}
+
+
+@frappe.whitelist()
+def get_timeline(doctype, name, limit=20, cursor=None):
+	"""
+	Get one page of the activity timeline of a lead or deal, newest first
+
+	Versions, comments, attachment logs and communications are read as creation ordered
+	streams and merged lazily, so a page only reads about `limit` rows per source however long
+	the history is. A deal's timeline includes the lead it was converted from. Pass the returned
+	`next_cursor` to get the following page; it is None on the last page.
+	"""
+	if doctype not in ["CRM Lead", "CRM Deal"]:
+		frappe.throw(_("Timeline is not available for {0}").format(_(doctype)))
+
+	frappe.has_permission(doctype, "read", name, throw=True)
+	limit = cint(limit) or 20
+	if cursor:
+		creation, source, cursor_name = decode_cursor(cursor)
+		cursor = (get_datetime(creation), source, cursor_name)
+
+	docs = {doctype: name}
+	if doctype == "CRM Deal" and (lead := frappe.db.get_value("CRM Deal", name, "lead")):
+		docs["CRM Lead"] = lead
+
+	# one more than a page, so the page can be filled even when its last group continues
+	batch_size = limit + 1
+	streams = [
+		get_version_stream(docs, cursor, batch_size),
+		get_comment_stream(docs, cursor, batch_size),
+		get_communication_stream(docs, cursor, batch_size),
+		get_creation_stream(docs, cursor),
+	]
+	merged = heapq.merge(*streams, key=lambda item: item[0], reverse=True)
+
+	activities, next_cursor = paginate_timeline(merged, limit)
+	load_attachments(activities)
+	return {
+		"activities": activities,
+		"next_cursor": encode_cursor(next_cursor) if next_cursor else None,
+	}
+
+
+def paginate_timeline(items, limit):
+	"""
+	Take `limit` activities from merged `(key, activity)` items
+
+	Consecutive changes by the same user are grouped under `other_versions` of the newest one,
+	like `crm.api.activities.handle_multiple_versions`. A page only ends where a group ends, so
+	groups are never split between pages. Returns the activities and the key of the last item read.
+	"""
+	activities = []
+	last_key = None
+	for key, activity in items:
+		previous = activities[-1] if activities else None
+		if (
+			previous
+			and is_version_activity(activity)
+			and is_version_activity(previous)
+			and previous["owner"] == activity["owner"]
+		):
+			previous.setdefault("other_versions", []).append(activity)
+		elif len(activities) == limit:
+			return activities, last_key
+		else:
+			activities.append(activity)
+		last_key = key
+	return activities, None
+
+
+def iter_source(source, get_query, cursor, batch_size):
+	"""Yield rows of one source newest first, see iter_source_batches"""
+	for rows in iter_source_batches(source, get_query, cursor, batch_size):
+		yield from rows
+
+
+def iter_source_batches(source, get_query, cursor, batch_size):
+	"""
+	Yield batches of `batch_size` rows of one source newest first
+
+	`get_query` returns the source's table and a query with its filters applied. Rows are read
+	after `cursor`, a (creation, source, name) key; rows of other sources with the same creation
+	are ordered by source, so the key is unique across the merged timeline.
+	"""
+	position = cursor
+	while True:
+		Table, query = get_query()
+		if condition := get_seek_condition(Table, source, position):
+			query = query.where(condition)
+
+		rows = (
+			query.orderby(Table.creation, order=Order.desc)
+			.orderby(Table.name, order=Order.desc)
+			.limit(batch_size)
+			.run(as_dict=True)
+		)
+		yield rows
+
+		if len(rows) < batch_size:
+			return
+		position = (rows[-1].creation, source, rows[-1].name)
+
+
+def get_seek_condition(Table, source, cursor):
+	if not cursor:
+		return None
+
+	creation, cursor_source, name = cursor
+	if source < cursor_source:
+		return Table.creation <= creation
+	if source > cursor_source:
+		return Table.creation < creation
+	return (Table.creation < creation) | ((Table.creation == creation) & (Table.name < name))
+
+
+def get_version_stream(docs, cursor, batch_size):
+	def get_query():
+		Version = frappe.qb.DocType("Version")
+		query = (
+			frappe.qb.from_(Version)
+			.select(
+				Version.name,
+				Version.creation,
+				Version.owner,
+				Version.data,
+				Version.ref_doctype,
+				Version.docname,
+			)
+			.where(
+				Criterion.any(
+					(Version.ref_doctype == doctype) & (Version.docname == name)
+					for doctype, name in docs.items()
+				)
+			)
+		)
+		return Version, query
+
+	for versions in iter_source_batches("version", get_query, cursor, batch_size):
+		for version, activity in zip(versions, get_version_activities(versions), strict=True):
+			if activity:
+				yield (version.creation, "version", version.name), activity
+
+
+def get_comment_stream(docs, cursor, batch_size):
+	def get_query():
+		Comment = frappe.qb.DocType("Comment")
+		query = (
+			frappe.qb.from_(Comment)
+			.select(
+				Comment.name,
+				Comment.creation,
+				Comment.owner,
+				Comment.content,
+				Comment.comment_type,
+				Comment.reference_doctype,
+			)
+			.where(Comment.comment_type.isin(["Comment", "Attachment", "Attachment Removed"]))
+			.where(
+				Criterion.any(
+					(Comment.reference_doctype == doctype) & (Comment.reference_name == name)
+					for doctype, name in docs.items()
+				)
+			)
+		)
+		return Comment, query
+
+	for comment in iter_source("comment", get_query, cursor, batch_size):
+		is_lead = comment.reference_doctype == "CRM Lead"
+		if comment.comment_type == "Comment":
+			activity = get_comment_activity(comment, is_lead=is_lead)
+		else:
+			activity = get_attachment_log_activity(comment, is_lead=is_lead)
+		yield (comment.creation, "comment", comment.name), activity
+
+
+def get_communication_stream(docs, cursor, batch_size):
+	def get_query():
+		return get_communication_query(docs, ["Communication", "Automated Message"], preview=True)
+
+	for communication in iter_source("communication", get_query, cursor, batch_size):
+		is_lead = communication.reference_doctype == "CRM Lead"
+		activity = prepare_communication_activity(communication, is_lead=is_lead)
+		yield (communication.creation, "communication", communication.name), activity
+
+
+def get_creation_stream(docs, cursor):
+	"""Creation entries of the lead and deal, as in `crm.api.activities.get_deal_activities`"""
+	activities = []
+	for doctype, name in docs.items():
+		creation, owner = frappe.db.get_value(doctype, name, ["creation", "owner"])
+		key = (creation, "creation", f"{name}_creation")
+		if cursor and key >= cursor:
+			continue
+		activities.append((key, get_creation_activity(doctype, name, creation, owner, "CRM Lead" in docs)))
+
+	activities.sort(key=lambda item: item[0], reverse=True)
+	yield from activities
+
+
+def get_creation_activity(doctype, name, creation, owner, from_lead=False):
+	if doctype == "CRM Lead":
+		data = _("created this lead")
+	elif from_lead:
+		data = _("converted the lead to this deal")
+	else:
+		data = _("created this deal")
+
+	return {
+		"name": f"{name}_creation",
+		"activity_type": "creation",
+		"creation": creation,
+		"owner": owner,
+		"data": data,
+		"is_lead": doctype == "CRM Lead",
+	}
+
+
+@frappe.whitelist()
+def get_activity_feed(doctype, name, limit=20, cursor=None, activity_types=None):
+	"""
+	Get one page of the activity feed of a lead or deal from CRM Activity, newest first
+
+	Unlike `get_timeline` this is one indexed range scan over the feed table; only the sources
+	of the returned page are read. A deal's feed includes the lead it was converted from.
+	`activity_types` defaults to the timeline types; calls, notes, tasks and attachments can
+	be requested as well.
+	"""
+	if doctype not in FEED_DOCTYPES:
+		frappe.throw(_("Activity feed is not available for {0}").format(_(doctype)))
+
+	frappe.has_permission(doctype, "read", name, throw=True)
+	limit = cint(limit) or 20
+	activity_types = frappe.parse_json(activity_types) if activity_types else TIMELINE_ACTIVITY_TYPES
+	if cursor:
+		activity_date, cursor_name = decode_cursor(cursor)
+		cursor = (get_datetime(activity_date), cursor_name)
+
+	items = iter_feed(doctype, name, activity_types, cursor, batch_size=limit + 1)
+	activities, next_cursor = paginate_timeline(items, limit)
+	load_attachments(activities)
+	return {
+		"activities": activities,
+		"next_cursor": encode_cursor(next_cursor) if next_cursor else None,
+	}
+
+
+def iter_feed(doctype, name, activity_types, cursor, batch_size):
+	"""Yield `((activity_date, name), activity)` of a feed newest first, `batch_size` rows at a time"""
+	position = cursor
+	while True:
+		Activity = frappe.qb.DocType("CRM Activity")
+		query = (
+			frappe.qb.from_(Activity)
+			.select(
+				Activity.name,
+				Activity.reference_doctype,
+				Activity.activity_type,
+				Activity.activity_doctype,
+				Activity.activity_name,
+				Activity.activity_date,
+			)
+			.where(Activity.activity_type.isin(activity_types))
+			.orderby(Activity.activity_date, order=Order.desc)
+			.orderby(Activity.name, order=Order.desc)
+			.limit(batch_size)
+		)
+		if doctype == "CRM Deal":
+			query = query.where(Activity.deal == name)
+		else:
+			query = query.where((Activity.reference_doctype == doctype) & (Activity.reference_name == name))
+
+		if position:
+			activity_date, activity_name = position
+			query = query.where(
+				(Activity.activity_date < activity_date)
+				| ((Activity.activity_date == activity_date) & (Activity.name < activity_name))
+			)
+
+		rows = query.run(as_dict=True)
+		sources = get_feed_sources(rows)
+		for row in rows:
+			source = sources.get(row.activity_doctype, {}).get(row.activity_name)
+			if source and (activity := get_feed_activity(row, source)):
+				yield (row.activity_date, row.name), activity
+
+		if len(rows) < batch_size:
+			return
+		position = (rows[-1].activity_date, rows[-1].name)
+
+
+def get_feed_sources(rows):
+	"""Source rows of feed rows, read with one query per source doctype"""
+	names = {}
+	for row in rows:
+		names.setdefault(row.activity_doctype, set()).add(row.activity_name)
+
+	sources = {}
+	for doctype, activity_names in names.items():
+		if doctype == "Communication":
+			Communication = frappe.qb.DocType("Communication")
+			communications = (
+				frappe.qb.from_(Communication)
+				.select(*get_communication_columns(Communication, preview=True))
+				.where(Communication.name.isin(list(activity_names)))
+				.run(as_dict=True)
+			)
+			sources[doctype] = {communication.name: communication for communication in communications}
+			continue
+
+		sources[doctype] = {
+			source.name: source
+			for source in frappe.get_all(
+				doctype, filters={"name": ("in", list(activity_names))}, fields=FEED_SOURCE_FIELDS[doctype]
+			)
+		}
+		if doctype == "CRM Call Log":
+			# callers and receivers of the page's calls are resolved together
+			parse_call_logs(list(sources[doctype].values()))
+		elif doctype == "Version":
+			versions = list(sources[doctype].values())
+			for version, activity in zip(versions, get_version_activities(versions), strict=True):
+				version.activity = activity
+	return sources
+
+
+def get_feed_activity(row, source):
+	is_lead = row.reference_doctype == "CRM Lead"
+	activity_type = row.activity_type
+
+	if activity_type == "version":
+		# copied as the timeline adds grouped versions to the entries it returns
+		return {**source.activity} if source.activity else None
+	if activity_type == "comment":
+		return get_comment_activity(source, is_lead=is_lead)
+	if activity_type == "attachment_log":
+		return get_attachment_log_activity(source, is_lead=is_lead)
+	if activity_type == "communication":
+		return prepare_communication_activity(source, is_lead=is_lead)
+	if activity_type == "creation":
+		return get_creation_activity(
+			row.activity_doctype, source.name, source.creation, source.owner, bool(source.get("lead"))
+		)
+	return {**source, "activity_type": activity_type, "is_lead": is_lead}
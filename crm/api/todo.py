@@ -1,12 +1,15 @@
 import frappe
 from frappe import _
 
+from crm.fcrm.doctype.crm_assignment_index.crm_assignment_index import sync_todo_assignment
 from crm.fcrm.doctype.crm_notification.crm_notification import notify_user
+from crm.fcrm.doctype.crm_record_visibility.crm_record_visibility import sync_todo_visibility
 
 
 def after_insert(doc, method=None):
     """Handle document sharing after ToDo creation"""
     share_on_assignment(doc)
+    sync_todo_assignment(doc)
 
     if (
         doc.reference_type in ["CRM Lead", "CRM Deal"]
@@ -22,6 +25,8 @@ def after_insert(doc, method=None):
                 doc.reference_type, doc.reference_name, fieldname, doc.allocated_to
             )
 
+    sync_todo_visibility(doc)
+
     if doc.reference_type in ["CRM Lead", "CRM Deal", "CRM Task"] and doc.reference_name and doc.allocated_to:
         notify_assigned_user(doc)
 
@@ -29,6 +34,8 @@ def after_insert(doc, method=None):
 def on_update(doc, method=None):
     """Handle document sharing on ToDo update"""
     share_on_assignment(doc)
+    sync_todo_assignment(doc)
+    sync_todo_visibility(doc)
 
     if (
         doc.has_value_changed("status")
@@ -41,6 +48,13 @@ def on_update(doc, method=None):
 
 
 def notify_assigned_user(doc, is_cancelled=False):
+    # Bulk updates send one notification per assignee and chunk, see crm.api.bulk_update
+    if bulk_update := frappe.flags.crm_bulk_update:
+        bulk_update.notifications.append(
+            (doc.reference_type, doc.reference_name, doc.allocated_to, is_cancelled)
+        )
+        return
+
     _doc = frappe.get_doc(doc.reference_type, doc.reference_name)
     owner = frappe.get_cached_value("User", frappe.session.user, "full_name")
     notification_text = get_notification_text(owner, doc, _doc, is_cancelled)
@@ -0,0 +1,99 @@
+import hashlib
+import json
+
+import frappe
+from frappe import _
+from frappe.model import no_value_fields
+
+from crm.api.views import get_views
+from crm.fcrm.doctype.crm_form_script.crm_form_script import get_form_script
+
+VIEW_SCHEMA_TTL = 24 * 60 * 60
+
+STANDARD_FIELDS = [
+	{"label": "Name", "fieldtype": "Data", "fieldname": "name"},
+	{"label": "Created On", "fieldtype": "Datetime", "fieldname": "creation"},
+	{"label": "Last Modified", "fieldtype": "Datetime", "fieldname": "modified"},
+	{
+		"label": "Modified By",
+		"fieldtype": "Link",
+		"fieldname": "modified_by",
+		"options": "User",
+	},
+	{"label": "Assigned To", "fieldtype": "Text", "fieldname": "_assign"},
+	{"label": "Owner", "fieldtype": "Link", "fieldname": "owner", "options": "User"},
+	{"label": "Like", "fieldtype": "Data", "fieldname": "_liked_by"},
+]
+
+# doctype -> field holding the doctype whose view schema it affects
+SCHEMA_SOURCES = {
+	"CRM View Settings": "dt",
+	"CRM Form Script": "dt",
+	"Custom Field": "dt",
+	"Property Setter": "doc_type",
+	"DocType": "name",
+}
+
+
+def get_view_schema(doctype):
+	"""
+	Get the static part of the list view payload of `doctype`
+
+	Fields, views and form scripts only change when meta, views or scripts are edited, so they
+	are cached per user and language until one of SCHEMA_SOURCES changes for this doctype.
+	The returned `schema_hash` lets clients skip the schema when they already have it.
+	"""
+	cache_key = (
+		f"crm_view_schema::{doctype}::{get_view_schema_version(doctype)}"
+		f"::{frappe.session.user}::{frappe.local.lang}"
+	)
+	schema = frappe.cache().get_value(cache_key)
+	if schema is None:
+		schema = build_view_schema(doctype)
+		schema["schema_hash"] = hashlib.md5(
+			json.dumps(schema, sort_keys=True, default=str).encode()
+		).hexdigest()
+		frappe.cache().set_value(cache_key, schema, expires_in_sec=VIEW_SCHEMA_TTL)
+	return schema
+
+
+def build_view_schema(doctype):
+	fields = frappe.get_meta(doctype).fields
+	fields = [field for field in fields if field.fieldtype not in no_value_fields]
+	fields = [
+		{
+			"label": _(field.label),
+			"fieldtype": field.fieldtype,
+			"fieldname": field.fieldname,
+			"options": field.options,
+		}
+		for field in fields
+		if field.label and field.fieldname
+	]
+
+	for field in STANDARD_FIELDS:
+		if field not in fields:
+			fields.append({**field, "label": _(field["label"])})
+
+	return {
+		"fields": fields,
+		"views": get_views(doctype),
+		"form_script": get_form_script(doctype),
+		"list_script": get_form_script(doctype, "List"),
+	}
+
+
+def get_view_schema_version(doctype):
+	return frappe.cache().get_value(f"crm_view_schema_version::{doctype}") or "0"
+
+
+def clear_view_schema_cache(doctype):
+	"""Invalidate the cached view schema of `doctype` for all users"""
+	frappe.cache().set_value(f"crm_view_schema_version::{doctype}", frappe.generate_hash(length=10))
+
+
+def on_schema_change(doc, method=None):
+	"""Clear the view schema of the doctype affected by `doc`"""
+	fieldname = SCHEMA_SOURCES.get(doc.doctype)
+	if fieldname and doc.get(fieldname):
+		clear_view_schema_cache(doc.get(fieldname))
@@ -0,0 +1,89 @@
+import click
+from frappe.commands import pass_context
+from frappe.exceptions import SiteNotSpecifiedError
+
+
+@click.command("rebuild-crm-visibility")
+@click.option("--doctype", help="Only rebuild CRM Lead, CRM Deal or CRM Task")
+@pass_context
+def rebuild_crm_visibility(context, doctype=None):
+	"""Rebuild the CRM Record Visibility table from owners and shares"""
+	import frappe
+
+	from crm.fcrm.doctype.crm_record_visibility.crm_record_visibility import rebuild_record_visibility
+
+	for site in get_sites(context):
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			rebuild_record_visibility(doctype)
+			frappe.db.commit()
+		finally:
+			frappe.destroy()
+
+
+@click.command("check-crm-visibility")
+@click.option("--doctype", help="Only check CRM Lead, CRM Deal or CRM Task")
+@click.option("--fix", is_flag=True, default=False, help="Rebuild doctypes that are out of sync")
+@pass_context
+def check_crm_visibility(context, doctype=None, fix=False):
+	"""Compare the CRM Record Visibility table with owners and shares"""
+	import frappe
+
+	from crm.fcrm.doctype.crm_record_visibility.crm_record_visibility import check_record_visibility
+
+	for site in get_sites(context):
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			for _doctype, result in check_record_visibility(doctype, fix=fix).items():
+				click.echo(f"{site} {_doctype}: {result['missing']} missing, {result['stale']} stale")
+			if fix:
+				frappe.db.commit()
+		finally:
+			frappe.destroy()
+
+
+@click.command("backfill-crm-activity")
+@pass_context
+def backfill_crm_activity(context):
+	"""Rebuild the CRM Activity feed of leads and deals from existing records"""
+	import frappe
+
+	from crm.fcrm.doctype.crm_activity.crm_activity import backfill_activity_feed
+
+	for site in get_sites(context):
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			backfill_activity_feed()
+			frappe.db.commit()
+		finally:
+			frappe.destroy()
+
+
+@click.command("rebuild-crm-phone-index")
+@pass_context
+def rebuild_crm_phone_index(context):
+	"""Rebuild the CRM Phone Index from the numbers of leads, deals and contacts"""
+	import frappe
+
+	from crm.fcrm.doctype.crm_phone_index.crm_phone_index import rebuild_phone_index
+
+	for site in get_sites(context):
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			rebuild_phone_index()
+			frappe.db.commit()
+		finally:
+			frappe.destroy()
+
+
+def get_sites(context):
+	if not context.sites:
+		raise SiteNotSpecifiedError
+	return context.sites
+
+
+commands = [rebuild_crm_visibility, check_crm_visibility, backfill_crm_activity, rebuild_crm_phone_index]
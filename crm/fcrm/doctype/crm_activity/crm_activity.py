@@ -0,0 +1,287 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+# Doctypes with an activity feed
+FEED_DOCTYPES = ["CRM Lead", "CRM Deal"]
+
+# Source doctype -> fields holding the lead or deal it belongs to
+REFERENCE_FIELDS = {
+	"Version": ("ref_doctype", "docname"),
+	"Comment": ("reference_doctype", "reference_name"),
+	"Communication": ("reference_doctype", "reference_name"),
+	"File": ("attached_to_doctype", "attached_to_name"),
+	"CRM Call Log": ("reference_doctype", "reference_docname"),
+	"FCRM Note": ("reference_doctype", "reference_docname"),
+	"CRM Task": ("reference_doctype", "reference_docname"),
+}
+
+# Source doctype -> child table of further Dynamic Link references
+LINK_TABLES = {
+	"Communication": ("timeline_links", "Communication Link"),
+	"CRM Call Log": ("links", "Dynamic Link"),
+}
+
+
+class CRMActivity(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("CRM Activity", ["deal", "activity_date"])
+	frappe.db.add_index("CRM Activity", ["reference_doctype", "reference_name", "activity_date"])
+	frappe.db.add_index("CRM Activity", ["activity_doctype", "activity_name"])
+	frappe.db.add_index("CRM Activity", ["lead"])
+
+
+def get_activity_type(doc):
+	"""Feed activity type of a source document or row, None when it is not shown"""
+	if doc.doctype == "Comment":
+		return {
+			"Comment": "comment",
+			"Attachment": "attachment_log",
+			"Attachment Removed": "attachment_log",
+		}.get(doc.comment_type)
+	if doc.doctype == "Communication":
+		return "communication" if doc.communication_type in ["Communication", "Automated Message"] else None
+	return {
+		"Version": "version",
+		"File": "attachment",
+		"CRM Call Log": "call",
+		"FCRM Note": "note",
+		"CRM Task": "task",
+	}.get(doc.doctype)
+
+
+def get_activity_references(doc):
+	"""Leads and deals whose feed `doc` belongs to"""
+	doctype_field, name_field = REFERENCE_FIELDS[doc.doctype]
+	references = {(doc.get(doctype_field), doc.get(name_field))}
+
+	if link_table := LINK_TABLES.get(doc.doctype):
+		references |= {(link.link_doctype, link.link_name) for link in doc.get(link_table[0]) or []}
+
+	return {(doctype, name) for doctype, name in references if doctype in FEED_DOCTYPES and name}
+
+
+def sync_activity(doc, method=None):
+	"""Add, move or remove the feed rows of a source document, on insert and on every update"""
+	activity_type = get_activity_type(doc)
+	references = get_activity_references(doc) if activity_type else set()
+
+	existing = set(
+		frappe.get_all(
+			"CRM Activity",
+			filters={"activity_doctype": doc.doctype, "activity_name": doc.name},
+			fields=["reference_doctype", "reference_name"],
+			as_list=True,
+		)
+	)
+	if existing == references:
+		return
+	remove_activity(doc)
+
+	insert_activities(
+		[(doctype, name, activity_type, doc.doctype, doc.name, doc.creation) for doctype, name in references]
+	)
+
+
+def remove_activity(doc, method=None):
+	frappe.db.delete("CRM Activity", {"activity_doctype": doc.doctype, "activity_name": doc.name})
+
+
+def on_reference_insert(doc, method=None):
+	"""Start the feed of a new lead or deal with its creation entry"""
+	insert_activities([(doc.doctype, doc.name, "creation", doc.doctype, doc.name, doc.creation)])
+
+
+def on_deal_update(doc, method=None):
+	"""Point the feed of the lead a deal was converted from to the deal, also on insert"""
+	if doc.has_value_changed("lead"):
+		if previous := doc.get_doc_before_save():
+			unlink_lead_feed(previous.lead)
+		link_lead_feed(doc.name, doc.lead)
+
+
+def on_reference_trash(doc, method=None):
+	"""
+	Remove the feed of a deleted lead or deal and the pointers other feeds hold to it
+
+	CRM Activity is in `ignore_links_on_delete`, so these rows never block the deletion.
+	"""
+	frappe.db.delete("CRM Activity", {"reference_doctype": doc.doctype, "reference_name": doc.name})
+	if doc.doctype == "CRM Deal":
+		unlink_lead_feed(doc.lead)
+	else:
+		frappe.db.set_value("CRM Activity", {"lead": doc.name}, "lead", None, update_modified=False)
+
+
+def link_lead_feed(deal, lead):
+	"""
+	Show the history of `lead` in the feed of the deal converted from it
+
+	Rows of the deal point to the lead and rows of the lead point to the deal, so
+	conversion only updates pointers and nothing is copied. A deal without a lead
+	stops pointing to its previous one.
+	"""
+	if lead:
+		frappe.db.set_value(
+			"CRM Activity",
+			{"reference_doctype": "CRM Lead", "reference_name": lead},
+			"deal",
+			deal,
+			update_modified=False,
+		)
+	frappe.db.set_value(
+		"CRM Activity",
+		{"reference_doctype": "CRM Deal", "reference_name": deal},
+		"lead",
+		lead,
+		update_modified=False,
+	)
+
+
+def unlink_lead_feed(lead):
+	if lead:
+		frappe.db.set_value(
+			"CRM Activity",
+			{"reference_doctype": "CRM Lead", "reference_name": lead},
+			"deal",
+			None,
+			update_modified=False,
+		)
+
+
+def insert_activities(activities, deal_leads=None):
+	"""
+	Insert (reference_doctype, reference_name, activity_type, activity_doctype, activity_name, activity_date)
+	rows. `deal_leads` are (deal, lead) pairs to take pointers from, read for the references when not given.
+	"""
+	if not activities:
+		return
+
+	pointers = get_feed_pointers({(doctype, name) for doctype, name, *__ in activities}, deal_leads)
+	now = frappe.utils.now()
+	frappe.db.bulk_insert(
+		"CRM Activity",
+		fields=[
+			"name",
+			"reference_doctype",
+			"reference_name",
+			"lead",
+			"deal",
+			"activity_type",
+			"activity_doctype",
+			"activity_name",
+			"activity_date",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+		],
+		values=[
+			(
+				frappe.generate_hash(length=10),
+				doctype,
+				name,
+				*pointers[(doctype, name)],
+				activity_type,
+				activity_doctype,
+				activity_name,
+				activity_date,
+				now,
+				now,
+				"Administrator",
+				"Administrator",
+			)
+			for doctype, name, activity_type, activity_doctype, activity_name, activity_date in activities
+		],
+		chunk_size=5000,
+	)
+
+
+def get_feed_pointers(references, deal_leads=None):
+	"""(lead, deal) of each lead or deal reference"""
+	if deal_leads is None:
+		leads = [name for doctype, name in references if doctype == "CRM Lead"]
+		deals = [name for doctype, name in references if doctype == "CRM Deal"]
+		deal_leads = []
+		if leads:
+			deal_leads += frappe.get_all(
+				"CRM Deal", filters={"lead": ("in", leads)}, fields=["name", "lead"], as_list=True
+			)
+		if deals:
+			deal_leads += frappe.get_all(
+				"CRM Deal", filters={"name": ("in", deals)}, fields=["name", "lead"], as_list=True
+			)
+
+	lead_of_deal = dict(deal_leads)
+	deal_of_lead = {lead: deal for deal, lead in deal_leads if lead}
+	return {
+		(doctype, name): (name, deal_of_lead.get(name))
+		if doctype == "CRM Lead"
+		else (lead_of_deal.get(name), name)
+		for doctype, name in references
+	}
+
+
+def backfill_activity_feed():
+	"""Rebuild the whole feed from existing leads, deals and their sources"""
+	frappe.db.delete("CRM Activity")
+	deal_leads = frappe.get_all("CRM Deal", fields=["name", "lead"], as_list=True)
+
+	for doctype in FEED_DOCTYPES:
+		insert_activities(
+			[
+				(doctype, doc.name, "creation", doctype, doc.name, doc.creation)
+				for doc in frappe.get_all(doctype, fields=["name", "creation"])
+			],
+			deal_leads,
+		)
+
+	for source, (doctype_field, name_field) in REFERENCE_FIELDS.items():
+		fields = [
+			"name",
+			"creation",
+			f"{doctype_field} as reference_doctype",
+			f"{name_field} as reference_name",
+		]
+		if source == "Comment":
+			fields.append("comment_type")
+		elif source == "Communication":
+			fields.append("communication_type")
+
+		rows = frappe.get_all(source, filters={doctype_field: ("in", FEED_DOCTYPES)}, fields=fields)
+		activity_types = {row.name: get_activity_type(frappe._dict(row, doctype=source)) for row in rows}
+		references = {(row.reference_doctype, row.reference_name, row.name, row.creation) for row in rows}
+
+		if link_table := LINK_TABLES.get(source):
+			Source = frappe.qb.DocType(source)
+			Link = frappe.qb.DocType(link_table[1])
+			query = (
+				frappe.qb.from_(Link)
+				.join(Source)
+				.on(Source.name == Link.parent)
+				.select(Link.link_doctype, Link.link_name, Source.name, Source.creation)
+				.where(Link.parenttype == source)
+				.where(Link.link_doctype.isin(FEED_DOCTYPES))
+			)
+			if source == "Comment":
+				query = query.select(Source.comment_type)
+			elif source == "Communication":
+				query = query.select(Source.communication_type)
+
+			for link in query.run(as_dict=True):
+				activity_types.setdefault(link.name, get_activity_type(frappe._dict(link, doctype=source)))
+				references.add((link.link_doctype, link.link_name, link.name, link.creation))
+
+		insert_activities(
+			[
+				(doctype, name, activity_types[activity_name], source, activity_name, creation)
+				for doctype, name, activity_name, creation in references
+				if name and activity_types[activity_name]
+			],
+			deal_leads,
+		)
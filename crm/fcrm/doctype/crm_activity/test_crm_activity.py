@@ -0,0 +1,104 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from crm.fcrm.doctype.crm_activity.crm_activity import backfill_activity_feed
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+class UnitTestCRMActivity(UnitTestCase):
+	"""
+	Unit tests for CRMActivity.
+	Use this class for testing individual functions and methods.
+	"""
+
+	pass
+
+
+class IntegrationTestCRMActivity(IntegrationTestCase):
+	"""
+	Integration tests for CRMActivity.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def setUp(self):
+		self.lead = create_lead("Feed")
+
+	def test_sources_are_added_and_moved(self):
+		note = frappe.get_doc(
+			{
+				"doctype": "FCRM Note",
+				"title": "Feed note",
+				"reference_doctype": "CRM Lead",
+				"reference_docname": self.lead,
+			}
+		).insert(ignore_permissions=True)
+		self.assertIn(("note", "FCRM Note", note.name), get_feed("CRM Lead", self.lead))
+
+		other_lead = create_lead("Other feed")
+		note.reference_docname = other_lead
+		note.save(ignore_permissions=True)
+		self.assertNotIn(("note", "FCRM Note", note.name), get_feed("CRM Lead", self.lead))
+		self.assertIn(("note", "FCRM Note", note.name), get_feed("CRM Lead", other_lead))
+
+	def test_conversion_links_lead_feed(self):
+		deal = frappe.get_doc({"doctype": "CRM Deal", "lead": self.lead}).insert(ignore_permissions=True)
+		self.assertEqual(get_pointers("CRM Lead", self.lead), {(self.lead, deal.name)})
+		self.assertEqual(get_pointers("CRM Deal", deal.name), {(self.lead, deal.name)})
+
+		frappe.delete_doc("CRM Deal", deal.name, ignore_permissions=True)
+		self.assertEqual(get_pointers("CRM Lead", self.lead), {(self.lead, None)})
+		self.assertEqual(get_feed("CRM Deal", deal.name), set())
+
+	def test_delete_lead_with_feed(self):
+		comment = frappe.get_doc("CRM Lead", self.lead).add_comment("Comment", "Feed comment")
+		self.assertIn(("comment", "Comment", comment.name), get_feed("CRM Lead", self.lead))
+
+		frappe.delete_doc("CRM Lead", self.lead, ignore_permissions=True)
+		self.assertEqual(get_feed("CRM Lead", self.lead), set())
+		self.assertFalse(frappe.db.exists("CRM Activity", {"lead": self.lead}))
+		self.assertFalse(frappe.db.exists("CRM Record Visibility", {"reference_name": self.lead}))
+
+	def test_backfill(self):
+		comment = frappe.get_doc("CRM Lead", self.lead).add_comment("Comment", "Feed comment")
+		feed = get_feed("CRM Lead", self.lead)
+		self.assertIn(("creation", "CRM Lead", self.lead), feed)
+		self.assertIn(("comment", "Comment", comment.name), feed)
+
+		frappe.db.delete("CRM Activity", {"reference_name": self.lead})
+		backfill_activity_feed()
+		self.assertEqual(get_feed("CRM Lead", self.lead), feed)
+
+
+def get_feed(doctype, name):
+	return set(
+		frappe.get_all(
+			"CRM Activity",
+			filters={"reference_doctype": doctype, "reference_name": name},
+			fields=["activity_type", "activity_doctype", "activity_name"],
+			as_list=True,
+		)
+	)
+
+
+def get_pointers(doctype, name):
+	return set(
+		frappe.get_all(
+			"CRM Activity",
+			filters={"reference_doctype": doctype, "reference_name": name},
+			fields=["lead", "deal"],
+			as_list=True,
+		)
+	)
+
+
+def create_lead(first_name):
+	lead = frappe.get_doc({"doctype": "CRM Lead", "first_name": first_name})
+	return lead.insert(ignore_permissions=True).name
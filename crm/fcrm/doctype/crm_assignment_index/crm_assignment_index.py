@@ -0,0 +1,118 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+# Doctypes whose open ToDo assignments are mirrored in CRM Assignment Index
+ASSIGNMENT_INDEX_DOCTYPES = ["CRM Lead", "CRM Deal", "CRM Task"]
+
+
+class CRMAssignmentIndex(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("CRM Assignment Index", ["user", "reference_doctype", "reference_name"])
+	frappe.db.add_index("CRM Assignment Index", ["reference_doctype", "reference_name"])
+
+
+def sync_todo_assignment(todo):
+	"""Mirror the assignment of `todo` (and of its previous assignee) in the index"""
+	if todo.reference_type not in ASSIGNMENT_INDEX_DOCTYPES or not todo.reference_name:
+		return
+
+	users = {todo.allocated_to}
+	if previous := todo.get_doc_before_save():
+		users.add(previous.allocated_to)
+
+	for user in users:
+		if user:
+			update_assignment(todo.reference_type, todo.reference_name, user)
+
+
+def update_assignment(reference_doctype, reference_name, user):
+	filters = {"reference_doctype": reference_doctype, "reference_name": reference_name, "user": user}
+	is_assigned = frappe.db.exists(
+		"ToDo",
+		{
+			"reference_type": reference_doctype,
+			"reference_name": reference_name,
+			"allocated_to": user,
+			"status": "Open",
+		},
+	)
+	is_indexed = frappe.db.exists("CRM Assignment Index", filters)
+
+	if is_assigned and not is_indexed:
+		frappe.get_doc({"doctype": "CRM Assignment Index", **filters}).insert(ignore_permissions=True)
+	elif is_indexed and not is_assigned:
+		frappe.db.delete("CRM Assignment Index", filters)
+
+
+def on_todo_trash(doc, method=None):
+	if doc.reference_type in ASSIGNMENT_INDEX_DOCTYPES and doc.reference_name and doc.allocated_to:
+		frappe.db.delete(
+			"CRM Assignment Index",
+			{
+				"reference_doctype": doc.reference_type,
+				"reference_name": doc.reference_name,
+				"user": doc.allocated_to,
+			},
+		)
+
+
+def on_reference_trash(doc, method=None):
+	frappe.db.delete("CRM Assignment Index", {"reference_doctype": doc.doctype, "reference_name": doc.name})
+
+
+def get_assigned_condition(doctype, user):
+	"""
+	List filter condition selecting `doctype` records with an open assignment to `user`
+
+	The index is read in a subquery on its (user, reference_doctype, reference_name) index, so
+	the database resolves the assigned records however many there are.
+	"""
+	return f"""`tab{doctype}`.name in (
+		select `tabCRM Assignment Index`.reference_name from `tabCRM Assignment Index`
+		where `tabCRM Assignment Index`.user = {frappe.db.escape(user)}
+			and `tabCRM Assignment Index`.reference_doctype = {frappe.db.escape(doctype)}
+	)"""
+
+
+def rebuild_assignment_index():
+	"""Rebuild the whole index from open ToDos"""
+	frappe.db.delete("CRM Assignment Index")
+
+	assignments = frappe.get_all(
+		"ToDo",
+		filters={
+			"reference_type": ("in", ASSIGNMENT_INDEX_DOCTYPES),
+			"reference_name": ("is", "set"),
+			"allocated_to": ("is", "set"),
+			"status": "Open",
+		},
+		fields=["reference_type", "reference_name", "allocated_to"],
+		distinct=True,
+		as_list=True,
+	)
+
+	now = frappe.utils.now()
+	frappe.db.bulk_insert(
+		"CRM Assignment Index",
+		fields=[
+			"name",
+			"reference_doctype",
+			"reference_name",
+			"user",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+		],
+		values=[
+			(frappe.generate_hash(length=10), *assignment, now, now, "Administrator", "Administrator")
+			for assignment in assignments
+		],
+		chunk_size=5000,
+	)
@@ -0,0 +1,100 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from crm.api.doc import convert_filter_to_tuple, resolve_filters
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+class UnitTestCRMAssignmentIndex(UnitTestCase):
+	"""
+	Unit tests for CRMAssignmentIndex.
+	Use this class for testing individual functions and methods.
+	"""
+
+	pass
+
+
+class IntegrationTestCRMAssignmentIndex(IntegrationTestCase):
+	"""
+	Integration tests for CRMAssignmentIndex.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def setUp(self):
+		self.user = create_user("assignment-index@example.com")
+		self.last_name = frappe.generate_hash(length=10)
+		self.lead = create_lead(self.last_name)
+
+	def test_index_follows_todo(self):
+		todo = assign(self.lead, self.user)
+		self.assertTrue(is_indexed(self.lead, self.user))
+
+		for status, indexed in [("Closed", False), ("Open", True), ("Cancelled", False), ("Open", True)]:
+			todo.status = status
+			todo.save(ignore_permissions=True)
+			self.assertEqual(is_indexed(self.lead, self.user), indexed, status)
+
+		todo.delete(ignore_permissions=True)
+		self.assertFalse(is_indexed(self.lead, self.user))
+
+	def test_index_matches_assign_filter(self):
+		other_user = create_user("assignment-index-other@example.com")
+		assign(self.lead, self.user)
+		assign(create_lead(self.last_name), other_user)
+		closed = assign(create_lead(self.last_name), self.user)
+		closed.status = "Closed"
+		closed.save(ignore_permissions=True)
+
+		for user in [self.user, other_user]:
+			filters = {"_assign": ["like", f"%{user}%"], "last_name": self.last_name}
+			expected = frappe.get_list("CRM Lead", filters=filters, pluck="name")
+
+			resolved = resolve_filters("CRM Lead", filters.copy())
+			self.assertEqual(resolved["_assign"], ["assigned_user", user])
+			names = frappe.get_list(
+				"CRM Lead", filters=convert_filter_to_tuple("CRM Lead", resolved), pluck="name"
+			)
+			self.assertEqual(sorted(names), sorted(expected))
+			self.assertEqual(len(names), 1)
+
+
+def assign(lead, user):
+	todo = frappe.get_doc(
+		{
+			"doctype": "ToDo",
+			"allocated_to": user,
+			"reference_type": "CRM Lead",
+			"reference_name": lead,
+			"description": "Assignment index",
+		}
+	)
+	return todo.insert(ignore_permissions=True)
+
+
+def is_indexed(lead, user):
+	return bool(
+		frappe.db.exists(
+			"CRM Assignment Index", {"reference_doctype": "CRM Lead", "reference_name": lead, "user": user}
+		)
+	)
+
+
+def create_lead(last_name):
+	lead = frappe.get_doc({"doctype": "CRM Lead", "first_name": "Assigned", "last_name": last_name})
+	return lead.insert(ignore_permissions=True).name
+
+
+def create_user(email):
+	if not frappe.db.exists("User", email):
+		frappe.get_doc(
+			{"doctype": "User", "email": email, "first_name": email.split("@")[0], "send_welcome_email": 0}
+		).insert(ignore_permissions=True)
+	return email
@@ -4,7 +4,7 @@
 import frappe
 from frappe.model.document import Document
 
-from crm.integrations.api import get_contact_by_phone_number
+from crm.integrations.api import get_contacts_by_phone_numbers
 from crm.utils import seconds_to_duration
 
 
@@ -81,7 +81,7 @@ class CRMCallLog(Document):
 		return {"columns": columns, "rows": rows}
 
 	def parse_list_data(calls):
-		return [parse_call_log(call) for call in calls] if calls else []
+		return parse_call_logs(calls) if calls else []
 
 	def has_link(self, doctype, name):
 		for link in self.links:
@@ -96,42 +96,68 @@ class CRMCallLog(Document):
 
 
 def parse_call_log(call):
-	call["show_recording"] = False
-	call["_duration"] = seconds_to_duration(call.get("duration"))
-	if call.get("type") == "Incoming":
-		call["activity_type"] = "incoming_call"
-		contact = get_contact_by_phone_number(call.get("from"))
-		receiver = (
-			frappe.db.get_values("User", call.get("receiver"), ["full_name", "user_image"])[0]
-			if call.get("receiver")
-			else [None, None]
-		)
-		call["_caller"] = {
-			"label": contact.get("full_name", "Unknown"),
-			"image": contact.get("image"),
-		}
-		call["_receiver"] = {
-			"label": receiver[0],
-			"image": receiver[1],
-		}
-	elif call.get("type") == "Outgoing":
-		call["activity_type"] = "outgoing_call"
-		contact = get_contact_by_phone_number(call.get("to"))
-		caller = (
-			frappe.db.get_values("User", call.get("caller"), ["full_name", "user_image"])[0]
-			if call.get("caller")
-			else [None, None]
-		)
-		call["_caller"] = {
-			"label": caller[0],
-			"image": caller[1],
+	return parse_call_logs([call])[0]
+
+
+def parse_call_logs(calls):
+	"""
+	Set the callers, receivers and durations of `calls`
+
+	The contacts of all their numbers and all their users are read with one query each, so a
+	list of calls costs the same few queries however long it is.
+	"""
+	numbers = set()
+	users = set()
+	for call in calls:
+		if call.get("type") == "Incoming":
+			numbers.add(call.get("from"))
+			users.add(call.get("receiver"))
+		elif call.get("type") == "Outgoing":
+			numbers.add(call.get("to"))
+			users.add(call.get("caller"))
+
+	contacts = get_contacts_by_phone_numbers(numbers) if numbers else {}
+	users = [user for user in users if user]
+	users = (
+		{
+			user.name: user
+			for user in frappe.get_all(
+				"User", filters={"name": ("in", users)}, fields=["name", "full_name", "user_image"]
+			)
 		}
-		call["_receiver"] = {
-			"label": contact.get("full_name", "Unknown"),
-			"image": contact.get("image"),
-		}
-
-	return call
+		if users
+		else {}
+	)
+
+	for call in calls:
+		call["show_recording"] = False
+		call["_duration"] = seconds_to_duration(call.get("duration"))
+		if call.get("type") == "Incoming":
+			call["activity_type"] = "incoming_call"
+			contact = contacts[call.get("from")]
+			receiver = users.get(call.get("receiver"), {})
+			call["_caller"] = {
+				"label": contact.get("full_name", "Unknown"),
+				"image": contact.get("image"),
+			}
+			call["_receiver"] = {
+				"label": receiver.get("full_name"),
+				"image": receiver.get("user_image"),
+			}
+		elif call.get("type") == "Outgoing":
+			call["activity_type"] = "outgoing_call"
+			contact = contacts[call.get("to")]
+			caller = users.get(call.get("caller"), {})
+			call["_caller"] = {
+				"label": caller.get("full_name"),
+				"image": caller.get("user_image"),
+			}
+			call["_receiver"] = {
+				"label": contact.get("full_name", "Unknown"),
+				"image": contact.get("image"),
+			}
+
+	return calls
 
 
 @frappe.whitelist()
@@ -0,0 +1,33 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Interval
+from frappe.query_builder.functions import Now
+
+
+class CRMDeletionLog(Document):
+	@staticmethod
+	def clear_old_logs(days=7):
+		table = frappe.qb.DocType("CRM Deletion Log")
+		frappe.db.delete(table, filters=(table.creation < (Now() - Interval(days=days))))
+
+
+def log_deletion(doc):
+	"""Record that `doc` was deleted so open list views can drop it"""
+	frappe.get_doc(
+		{
+			"doctype": "CRM Deletion Log",
+			"reference_doctype": doc.doctype,
+			"reference_name": doc.name,
+		}
+	).insert(ignore_permissions=True)
+
+
+def get_deleted_names(doctype, since, names=None):
+	"""Names of `doctype` deleted after `since`, optionally limited to `names`"""
+	filters = {"reference_doctype": doctype, "creation": (">", since)}
+	if names is not None:
+		filters["reference_name"] = ("in", names)
+	return frappe.get_all("CRM Deletion Log", filters=filters, pluck="reference_name", distinct=True)
@@ -0,0 +1,60 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+from frappe.utils import add_days, add_to_date, now
+
+from crm.fcrm.doctype.crm_deletion_log.crm_deletion_log import CRMDeletionLog, get_deleted_names
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+class UnitTestCRMDeletionLog(UnitTestCase):
+	"""
+	Unit tests for CRMDeletionLog.
+	Use this class for testing individual functions and methods.
+	"""
+
+	pass
+
+
+class IntegrationTestCRMDeletionLog(IntegrationTestCase):
+	"""
+	Integration tests for CRMDeletionLog.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def test_deletion_is_logged(self):
+		since = add_to_date(now(), seconds=-1)
+		lead = frappe.get_doc({"doctype": "CRM Lead", "first_name": "Deleted"}).insert(
+			ignore_permissions=True
+		)
+		deal = frappe.get_doc({"doctype": "CRM Deal"}).insert(ignore_permissions=True)
+
+		frappe.delete_doc("CRM Lead", lead.name, ignore_permissions=True)
+		frappe.delete_doc("CRM Deal", deal.name, ignore_permissions=True)
+
+		self.assertEqual(get_deleted_names("CRM Lead", since), [lead.name])
+		self.assertEqual(get_deleted_names("CRM Deal", since, [deal.name, "not-deleted"]), [deal.name])
+		self.assertEqual(get_deleted_names("CRM Lead", now()), [])
+
+	def test_clear_old_logs(self):
+		old = create_log("old-lead")
+		frappe.db.set_value("CRM Deletion Log", old, "creation", add_days(now(), -10), update_modified=False)
+		recent = create_log("recent-lead")
+
+		CRMDeletionLog.clear_old_logs(days=7)
+		self.assertFalse(frappe.db.exists("CRM Deletion Log", old))
+		self.assertTrue(frappe.db.exists("CRM Deletion Log", recent))
+
+
+def create_log(reference_name):
+	log = frappe.get_doc(
+		{"doctype": "CRM Deletion Log", "reference_doctype": "CRM Lead", "reference_name": reference_name}
+	)
+	return log.insert(ignore_permissions=True).name
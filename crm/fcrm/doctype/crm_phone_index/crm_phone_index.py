@@ -0,0 +1,197 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Criterion
+
+from crm.utils import parse_phone_number
+
+# Doctypes whose phone numbers are indexed, with their (field, is_primary) phone fields
+PHONE_INDEX_FIELDS = {
+	"CRM Lead": [("mobile_no", 1), ("phone", 0)],
+	"CRM Deal": [("mobile_no", 1), ("phone", 0)],
+	"Contact": [("mobile_no", 1), ("phone", 0)],
+}
+# Trailing digits compared when a number's country code or trunk prefix is unknown
+LAST_DIGITS_LENGTH = 10
+
+
+class CRMPhoneIndex(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("CRM Phone Index", ["e164", "reference_doctype"])
+	frappe.db.add_index("CRM Phone Index", ["national_number", "reference_doctype"])
+	frappe.db.add_index("CRM Phone Index", ["last_digits", "reference_doctype"])
+	frappe.db.add_index("CRM Phone Index", ["reference_doctype", "reference_name"])
+
+
+def get_phone_keys(phone):
+	"""
+	(e164, national_number, last_digits) of `phone`
+
+	Numbers are normalized like `crm_lead.CRMLead.normalize_phone_numbers`; numbers that can't
+	be parsed keep only their digits and plus sign.
+	"""
+	digits = "".join(c for c in phone if c.isdigit())
+	parsed = parse_phone_number(phone)
+	if parsed.get("success"):
+		e164 = parsed.get("formats", {}).get("E164") or phone
+		national_number = parsed.get("national_number") or digits
+	else:
+		e164 = "".join(c for c in phone if c.isdigit() or c == "+")
+		national_number = digits
+	return e164, national_number, digits[-LAST_DIGITS_LENGTH:]
+
+
+def get_phone_numbers(doc):
+	"""(phone, is_primary) of each number of `doc`, including Contact Phone rows"""
+	numbers = {}
+	for fieldname, is_primary in PHONE_INDEX_FIELDS[doc.doctype]:
+		if phone := (doc.get(fieldname) or "").strip():
+			numbers[phone] = max(numbers.get(phone, 0), is_primary)
+
+	for row in doc.get("phone_nos") or []:
+		if phone := (row.phone or "").strip():
+			is_primary = 1 if row.is_primary_mobile_no or row.is_primary_phone else 0
+			numbers[phone] = max(numbers.get(phone, 0), is_primary)
+
+	return numbers
+
+
+def sync_phone_index(doc, method=None):
+	"""Keep the indexed numbers of a lead, deal or contact in sync on save"""
+	numbers = get_phone_numbers(doc)
+	existing = dict(
+		frappe.get_all(
+			"CRM Phone Index",
+			filters={"reference_doctype": doc.doctype, "reference_name": doc.name},
+			fields=["phone", "is_primary"],
+			as_list=True,
+		)
+	)
+	if existing == numbers:
+		return
+
+	remove_from_phone_index(doc)
+	insert_phone_numbers(
+		[(doc.doctype, doc.name, phone, is_primary) for phone, is_primary in numbers.items()]
+	)
+
+
+def remove_from_phone_index(doc, method=None):
+	frappe.db.delete("CRM Phone Index", {"reference_doctype": doc.doctype, "reference_name": doc.name})
+
+
+def insert_phone_numbers(numbers):
+	"""Insert (reference_doctype, reference_name, phone, is_primary) rows"""
+	now = frappe.utils.now()
+	frappe.db.bulk_insert(
+		"CRM Phone Index",
+		fields=[
+			"name",
+			"phone",
+			"e164",
+			"national_number",
+			"last_digits",
+			"reference_doctype",
+			"reference_name",
+			"is_primary",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+		],
+		values=[
+			(
+				frappe.generate_hash(length=10),
+				phone,
+				*get_phone_keys(phone),
+				doctype,
+				name,
+				is_primary,
+				now,
+				now,
+				"Administrator",
+				"Administrator",
+			)
+			for doctype, name, phone, is_primary in numbers
+		],
+		chunk_size=5000,
+	)
+
+
+def find_by_phone_numbers(doctype, phone_numbers, keys=("national_number", "last_digits")):
+	"""
+	{phone_number: index rows} of `doctype` matching each of `phone_numbers` on any of `keys`
+
+	All numbers are looked up with one query of indexed equalities. `national_number` and
+	`last_digits` find candidates whatever prefix they were saved with, so callers confirm them
+	with `crm.utils.are_same_phone_number`.
+	"""
+	phone_keys = {
+		phone: dict(zip(("e164", "national_number", "last_digits"), get_phone_keys(phone), strict=True))
+		for phone in phone_numbers
+	}
+	matches = {phone: [] for phone in phone_keys}
+
+	PhoneIndex = frappe.qb.DocType("CRM Phone Index")
+	conditions = []
+	for key in keys:
+		if values := {values[key] for values in phone_keys.values() if values[key]}:
+			conditions.append(PhoneIndex[key].isin(list(values)))
+	if not conditions:
+		return matches
+
+	rows = (
+		frappe.qb.from_(PhoneIndex)
+		.select(PhoneIndex.name, PhoneIndex.reference_name, PhoneIndex.phone, PhoneIndex.is_primary, *keys)
+		.where(PhoneIndex.reference_doctype == doctype)
+		.where(Criterion.any(conditions))
+		.run(as_dict=True)
+	)
+	rows_by_key = {}
+	for row in rows:
+		for key in keys:
+			rows_by_key.setdefault((key, row[key]), []).append(row)
+
+	for phone, values in phone_keys.items():
+		found = {row.name: row for key in keys for row in rows_by_key.get((key, values[key]), [])}
+		matches[phone] = list(found.values())
+	return matches
+
+
+def rebuild_phone_index():
+	"""Rebuild the index from all leads, deals and contacts"""
+	frappe.db.delete("CRM Phone Index")
+
+	for doctype in ["CRM Lead", "CRM Deal"]:
+		numbers = []
+		for doc in frappe.get_all(doctype, fields=["name", "mobile_no", "phone"]):
+			doc.doctype = doctype
+			numbers += [
+				(doctype, doc.name, phone, is_primary) for phone, is_primary in get_phone_numbers(doc).items()
+			]
+		insert_phone_numbers(numbers)
+
+	contacts = {
+		contact.name: frappe._dict(contact, doctype="Contact", phone_nos=[])
+		for contact in frappe.get_all("Contact", fields=["name", "mobile_no", "phone"])
+	}
+	for row in frappe.get_all(
+		"Contact Phone",
+		filters={"parenttype": "Contact"},
+		fields=["parent", "phone", "is_primary_mobile_no", "is_primary_phone"],
+	):
+		if contact := contacts.get(row.parent):
+			contact.phone_nos.append(row)
+
+	insert_phone_numbers(
+		[
+			("Contact", contact.name, phone, is_primary)
+			for contact in contacts.values()
+			for phone, is_primary in get_phone_numbers(contact).items()
+		]
+	)
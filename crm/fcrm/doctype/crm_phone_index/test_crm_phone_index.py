@@ -0,0 +1,153 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import random
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from crm.api import avito, whatsapp
+from crm.fcrm.doctype.crm_phone_index.crm_phone_index import find_by_phone_numbers, get_phone_keys
+from crm.integrations.api import get_contacts_by_phone_numbers
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+class UnitTestCRMPhoneIndex(UnitTestCase):
+	"""
+	Unit tests for CRMPhoneIndex.
+	Use this class for testing individual functions and methods.
+	"""
+
+	def test_get_phone_keys(self):
+		for phone in ["+7 (912) 345-67-89", "8 912 345 67 89", "+79123456789", "79123456789"]:
+			with self.subTest(phone=phone):
+				self.assertEqual(get_phone_keys(phone), ("+79123456789", "9123456789", "9123456789"))
+
+		self.assertEqual(get_phone_keys("+1 (415) 555-0132 ext")[2], "4155550132")
+
+
+class IntegrationTestCRMPhoneIndex(IntegrationTestCase):
+	"""
+	Integration tests for CRMPhoneIndex.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def setUp(self):
+		self.mobile_no, self.phone, self.other_mobile_no = (create_phone_number() for __ in range(3))
+
+	def test_lead_and_deal_sync(self):
+		for doctype in ["CRM Lead", "CRM Deal"]:
+			with self.subTest(doctype=doctype):
+				doc = frappe.get_doc(
+					{
+						"doctype": doctype,
+						"first_name": "Indexed",
+						"mobile_no": format_phone_number(self.mobile_no),
+						"phone": self.phone,
+					}
+				).insert(ignore_permissions=True)
+				self.assertEqual(get_indexed(doc), {(self.mobile_no, 1), (self.phone, 0)})
+
+				doc.mobile_no = self.other_mobile_no
+				doc.save(ignore_permissions=True)
+				self.assertEqual(get_indexed(doc), {(self.other_mobile_no, 1), (self.phone, 0)})
+
+				frappe.delete_doc(doctype, doc.name, ignore_permissions=True)
+				self.assertEqual(get_indexed(doc), set())
+
+	def test_contact_sync(self):
+		contact = create_contact([self.mobile_no, self.phone])
+		self.assertEqual(get_indexed(contact), {(self.mobile_no, 1), (self.phone, 0)})
+
+		contact.phone_nos[1].phone = self.other_mobile_no
+		contact.save(ignore_permissions=True)
+		self.assertEqual(get_indexed(contact), {(self.mobile_no, 1), (self.other_mobile_no, 0)})
+
+		frappe.delete_doc("Contact", contact.name, ignore_permissions=True)
+		self.assertEqual(get_indexed(contact), set())
+
+	def test_find_by_phone_numbers(self):
+		lead = create_lead(self.mobile_no, self.phone)
+		looked_up = format_phone_number(self.mobile_no)
+
+		matches = find_by_phone_numbers("CRM Lead", [looked_up, self.phone, self.other_mobile_no])
+		self.assertEqual([row.reference_name for row in matches[looked_up]], [lead])
+		self.assertEqual([row.reference_name for row in matches[self.phone]], [lead])
+		self.assertEqual(matches[self.other_mobile_no], [])
+
+	def test_get_contacts_by_phone_numbers(self):
+		contact = create_contact([self.mobile_no])
+		lead = create_lead(self.phone)
+
+		results = get_contacts_by_phone_numbers(
+			[format_phone_number(self.mobile_no), self.phone, self.other_mobile_no]
+		)
+		self.assertEqual(results[format_phone_number(self.mobile_no)].name, contact.name)
+		self.assertEqual(results[self.phone].lead, lead)
+		self.assertFalse(results[self.other_mobile_no].get("name"))
+
+	def test_find_record_matches_primary_number(self):
+		lead = create_lead(self.mobile_no, self.phone)
+
+		for module in [whatsapp, avito]:
+			with self.subTest(module=module.__name__):
+				self.assertEqual(
+					module.get_lead_or_deal_from_number(self.mobile_no.lstrip("+")), (lead, "CRM Lead")
+				)
+				# only primary numbers are matched, like the mobile_no comparison the index replaced
+				self.assertEqual(module.get_lead_or_deal_from_number(self.phone)[0], None)
+
+		doc = frappe.get_doc("CRM Lead", lead)
+		doc.mobile_no = self.other_mobile_no
+		doc.save(ignore_permissions=True)
+		for module in [whatsapp, avito]:
+			with self.subTest(module=module.__name__):
+				self.assertEqual(module.get_lead_or_deal_from_number(self.mobile_no)[0], None)
+				self.assertEqual(
+					module.get_lead_or_deal_from_number(self.other_mobile_no), (lead, "CRM Lead")
+				)
+
+
+def get_indexed(doc):
+	return set(
+		frappe.get_all(
+			"CRM Phone Index",
+			filters={"reference_doctype": doc.doctype, "reference_name": doc.name},
+			fields=["e164", "is_primary"],
+			as_list=True,
+		)
+	)
+
+
+def create_phone_number():
+	return f"+7912{random.randint(0, 9999999):07d}"
+
+
+def format_phone_number(phone):
+	"""`phone` (+7XXXXXXXXXX) as it is often typed, e.g. 8 (912) 345-67-89"""
+	return f"8 ({phone[2:5]}) {phone[5:8]}-{phone[8:10]}-{phone[10:]}"
+
+
+def create_lead(mobile_no, phone=None):
+	lead = frappe.get_doc(
+		{"doctype": "CRM Lead", "first_name": "Indexed", "mobile_no": mobile_no, "phone": phone}
+	)
+	return lead.insert(ignore_permissions=True).name
+
+
+def create_contact(phones):
+	contact = frappe.get_doc(
+		{
+			"doctype": "Contact",
+			"first_name": "Indexed",
+			"phone_nos": [
+				{"phone": phone, "is_primary_mobile_no": 1 if i == 0 else 0} for i, phone in enumerate(phones)
+			],
+		}
+	)
+	return contact.insert(ignore_permissions=True)
@@ -0,0 +1,151 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+# Doctypes whose per user visibility is materialized, with the field holding their owner.
+# A user sees a record when they are its owner or it is shared with them (assignments share too).
+VISIBILITY_OWNER_FIELDS = {
+	"CRM Lead": "lead_owner",
+	"CRM Deal": "deal_owner",
+	"CRM Task": "owner",
+}
+
+
+class CRMRecordVisibility(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("CRM Record Visibility", ["user", "reference_doctype", "reference_name"])
+	frappe.db.add_index("CRM Record Visibility", ["reference_doctype", "reference_name"])
+
+
+def update_visibility(doctype, names, users):
+	"""Recompute which of `users` see which of `names` and update the table to match"""
+	users = [user for user in set(users) if user]
+	if doctype not in VISIBILITY_OWNER_FIELDS or not names or not users:
+		return
+
+	expected = get_visible_pairs(
+		doctype, {"name": ("in", names)}, {"share_name": ("in", names), "user": ("in", users)}
+	)
+	expected = {(name, user) for name, user in expected if user in users}
+	existing = set(
+		frappe.get_all(
+			"CRM Record Visibility",
+			filters={"reference_doctype": doctype, "reference_name": ("in", names), "user": ("in", users)},
+			fields=["reference_name", "user"],
+			as_list=True,
+		)
+	)
+
+	insert_visibility(doctype, expected - existing)
+	for name, user in existing - expected:
+		frappe.db.delete(
+			"CRM Record Visibility",
+			{"reference_doctype": doctype, "reference_name": name, "user": user},
+		)
+
+
+def get_visible_pairs(doctype, filters=None, share_filters=None):
+	"""(name, user) pairs of `doctype` that should be visible, from owners and read shares"""
+	owner_field = VISIBILITY_OWNER_FIELDS[doctype]
+	owned = frappe.get_all(
+		doctype,
+		filters={**(filters or {}), owner_field: ("is", "set")},
+		fields=["name", owner_field],
+		as_list=True,
+	)
+	shared = frappe.get_all(
+		"DocShare",
+		filters={**(share_filters or {}), "share_doctype": doctype, "user": ("is", "set"), "read": 1},
+		fields=["share_name", "user"],
+		as_list=True,
+	)
+	return {tuple(pair) for pair in owned} | {tuple(pair) for pair in shared}
+
+
+def insert_visibility(doctype, pairs):
+	now = frappe.utils.now()
+	frappe.db.bulk_insert(
+		"CRM Record Visibility",
+		fields=[
+			"name",
+			"reference_doctype",
+			"reference_name",
+			"user",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+		],
+		values=[
+			(frappe.generate_hash(length=10), doctype, name, user, now, now, "Administrator", "Administrator")
+			for name, user in pairs
+		],
+		chunk_size=5000,
+	)
+
+
+def on_reference_update(doc, method=None):
+	"""Follow owner changes of leads, deals and tasks"""
+	owner_field = VISIBILITY_OWNER_FIELDS.get(doc.doctype)
+	if not owner_field:
+		return
+
+	users = {doc.get(owner_field)}
+	if previous := doc.get_doc_before_save():
+		if previous.get(owner_field) == doc.get(owner_field):
+			return
+		users.add(previous.get(owner_field))
+	update_visibility(doc.doctype, [doc.name], users)
+
+
+def on_reference_trash(doc, method=None):
+	frappe.db.delete("CRM Record Visibility", {"reference_doctype": doc.doctype, "reference_name": doc.name})
+
+
+def on_docshare_change(doc, method=None):
+	"""Follow DocShare inserts, updates and deletes"""
+	if doc.share_doctype in VISIBILITY_OWNER_FIELDS and doc.share_name:
+		update_visibility(doc.share_doctype, [doc.share_name], [doc.user])
+
+
+def sync_todo_visibility(todo):
+	"""Assignments share the document and may set its owner, follow both for the assignee"""
+	if todo.reference_type in VISIBILITY_OWNER_FIELDS and todo.reference_name:
+		update_visibility(todo.reference_type, [todo.reference_name], [todo.allocated_to])
+
+
+def rebuild_record_visibility(doctype=None):
+	"""Rebuild the table from owners and DocShares, for one or all visibility doctypes"""
+	for _doctype in [doctype] if doctype else VISIBILITY_OWNER_FIELDS:
+		frappe.db.delete("CRM Record Visibility", {"reference_doctype": _doctype})
+		insert_visibility(_doctype, get_visible_pairs(_doctype))
+
+
+def check_record_visibility(doctype=None, fix=False):
+	"""
+	Compare the table with owners and DocShares
+
+	Returns the number of missing and stale rows per doctype. With `fix`, doctypes that
+	are out of sync are rebuilt.
+	"""
+	result = {}
+	for _doctype in [doctype] if doctype else VISIBILITY_OWNER_FIELDS:
+		expected = get_visible_pairs(_doctype)
+		existing = set(
+			frappe.get_all(
+				"CRM Record Visibility",
+				filters={"reference_doctype": _doctype},
+				fields=["reference_name", "user"],
+				as_list=True,
+			)
+		)
+		result[_doctype] = {"missing": len(expected - existing), "stale": len(existing - expected)}
+
+		if fix and expected != existing:
+			rebuild_record_visibility(_doctype)
+	return result
@@ -0,0 +1,85 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.share import add as add_share
+from frappe.share import remove as remove_share
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from crm.fcrm.doctype.crm_record_visibility.crm_record_visibility import (
+	check_record_visibility,
+	insert_visibility,
+	rebuild_record_visibility,
+)
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+class UnitTestCRMRecordVisibility(UnitTestCase):
+	"""
+	Unit tests for CRMRecordVisibility.
+	Use this class for testing individual functions and methods.
+	"""
+
+	pass
+
+
+class IntegrationTestCRMRecordVisibility(IntegrationTestCase):
+	"""
+	Integration tests for CRMRecordVisibility.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def setUp(self):
+		self.owner = create_user("visibility-owner@example.com")
+		self.agent = create_user("visibility-agent@example.com")
+		self.lead = frappe.get_doc(
+			{"doctype": "CRM Lead", "first_name": "Visibility", "lead_owner": self.owner}
+		).insert(ignore_permissions=True)
+
+	def test_owner_and_shares_are_visible(self):
+		self.assertEqual(get_visible_users(self.lead.name), {self.owner})
+
+		add_share("CRM Lead", self.lead.name, self.agent, read=1, flags={"ignore_share_permission": True})
+		self.assertEqual(get_visible_users(self.lead.name), {self.owner, self.agent})
+
+		remove_share("CRM Lead", self.lead.name, self.agent, flags={"ignore_share_permission": True})
+		self.assertEqual(get_visible_users(self.lead.name), {self.owner})
+
+	def test_check_and_rebuild(self):
+		frappe.db.delete("CRM Record Visibility", {"reference_name": self.lead.name})
+		insert_visibility("CRM Lead", [(self.lead.name, self.agent)])
+
+		result = check_record_visibility("CRM Lead")["CRM Lead"]
+		self.assertGreaterEqual(result["missing"], 1)
+		self.assertGreaterEqual(result["stale"], 1)
+
+		check_record_visibility("CRM Lead", fix=True)
+		self.assertEqual(check_record_visibility("CRM Lead"), {"CRM Lead": {"missing": 0, "stale": 0}})
+		self.assertEqual(get_visible_users(self.lead.name), {self.owner})
+
+		frappe.db.delete("CRM Record Visibility", {"reference_name": self.lead.name})
+		rebuild_record_visibility("CRM Lead")
+		self.assertEqual(get_visible_users(self.lead.name), {self.owner})
+
+
+def get_visible_users(lead):
+	return set(
+		frappe.get_all(
+			"CRM Record Visibility",
+			filters={"reference_doctype": "CRM Lead", "reference_name": lead},
+			pluck="user",
+		)
+	)
+
+
+def create_user(email):
+	if not frappe.db.exists("User", email):
+		frappe.get_doc(
+			{"doctype": "User", "email": email, "first_name": email.split("@")[0], "send_welcome_email": 0}
+		).insert(ignore_permissions=True)
+	return email
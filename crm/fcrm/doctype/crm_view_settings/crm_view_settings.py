@@ -6,6 +6,8 @@ import frappe
 from frappe.model.document import Document, get_controller
 from frappe.utils import parse_json
 
+from crm.api.view_schema import clear_view_schema_cache
+
 
 class CRMViewSettings(Document):
 	pass
@@ -161,6 +163,8 @@ def set_as_default(name=None, type=None, doctype=None):
 		0,
 	)
 
+	clear_view_schema_cache(frappe.db.get_value("CRM View Settings", name, "dt"))
+
 
 @frappe.whitelist()
 def create_or_update_standard_view(view):
@@ -139,32 +139,102 @@ override_doctype_class = {
 
 doc_events = {
 	"CRM Lead": {
-		"on_update": "crm.api.doc.on_doc_update",
-		"after_insert": "crm.api.doc.on_doc_update",
-		"on_trash": "crm.api.doc.on_doc_update",
+		"on_update": [
+			"crm.api.doc.on_doc_update",
+			"crm.fcrm.doctype.crm_record_visibility.crm_record_visibility.on_reference_update",
+			"crm.fcrm.doctype.crm_phone_index.crm_phone_index.sync_phone_index",
+		],
+		"after_insert": [
+			"crm.api.doc.on_doc_update",
+			"crm.fcrm.doctype.crm_record_visibility.crm_record_visibility.on_reference_update",
+			"crm.fcrm.doctype.crm_activity.crm_activity.on_reference_insert",
+		],
+		"on_trash": [
+			"crm.api.doc.on_doc_update",
+			"crm.fcrm.doctype.crm_assignment_index.crm_assignment_index.on_reference_trash",
+			"crm.fcrm.doctype.crm_record_visibility.crm_record_visibility.on_reference_trash",
+			"crm.fcrm.doctype.crm_activity.crm_activity.on_reference_trash",
+			"crm.fcrm.doctype.crm_phone_index.crm_phone_index.remove_from_phone_index",
+		],
 	},
 	"CRM Deal": {
 		"on_update": [
 			"crm.api.doc.on_doc_update",
-			"crm.fcrm.doctype.erpnext_crm_settings.erpnext_crm_settings.create_customer_in_erpnext"
+			"crm.fcrm.doctype.erpnext_crm_settings.erpnext_crm_settings.create_customer_in_erpnext",
+			"crm.fcrm.doctype.crm_record_visibility.crm_record_visibility.on_reference_update",
+			"crm.fcrm.doctype.crm_activity.crm_activity.on_deal_update",
+			"crm.fcrm.doctype.crm_phone_index.crm_phone_index.sync_phone_index",
+		],
+		"after_insert": [
+			"crm.api.doc.on_doc_update",
+			"crm.fcrm.doctype.crm_record_visibility.crm_record_visibility.on_reference_update",
+			"crm.fcrm.doctype.crm_activity.crm_activity.on_reference_insert",
+		],
+		"on_trash": [
+			"crm.api.doc.on_doc_update",
+			"crm.fcrm.doctype.crm_assignment_index.crm_assignment_index.on_reference_trash",
+			"crm.fcrm.doctype.crm_record_visibility.crm_record_visibility.on_reference_trash",
+			"crm.fcrm.doctype.crm_activity.crm_activity.on_reference_trash",
+			"crm.fcrm.doctype.crm_phone_index.crm_phone_index.remove_from_phone_index",
 		],
-		"after_insert": "crm.api.doc.on_doc_update",
-		"on_trash": "crm.api.doc.on_doc_update",
 	},
 	"CRM Task": {
-		"on_update": "crm.api.doc.on_doc_update",
-		"after_insert": "crm.api.doc.on_doc_update",
-		"on_trash": "crm.api.doc.on_doc_update",
+		"on_update": [
+			"crm.api.doc.on_doc_update",
+			"crm.fcrm.doctype.crm_activity.crm_activity.sync_activity",
+		],
+		"after_insert": [
+			"crm.api.doc.on_doc_update",
+			"crm.fcrm.doctype.crm_record_visibility.crm_record_visibility.on_reference_update",
+		],
+		"on_trash": [
+			"crm.api.doc.on_doc_update",
+			"crm.fcrm.doctype.crm_assignment_index.crm_assignment_index.on_reference_trash",
+			"crm.fcrm.doctype.crm_record_visibility.crm_record_visibility.on_reference_trash",
+			"crm.fcrm.doctype.crm_activity.crm_activity.remove_activity",
+		],
 	},
 	"Contact": {
 		"validate": ["crm.api.contact.validate"],
+		"on_update": ["crm.fcrm.doctype.crm_phone_index.crm_phone_index.sync_phone_index"],
+		"on_trash": ["crm.fcrm.doctype.crm_phone_index.crm_phone_index.remove_from_phone_index"],
+	},
+	"DocShare": {
+		"after_insert": ["crm.fcrm.doctype.crm_record_visibility.crm_record_visibility.on_docshare_change"],
+		"on_update": ["crm.fcrm.doctype.crm_record_visibility.crm_record_visibility.on_docshare_change"],
+		"after_delete": ["crm.fcrm.doctype.crm_record_visibility.crm_record_visibility.on_docshare_change"],
 	},
 	"ToDo": {
 		"after_insert": ["crm.api.todo.after_insert"],
 		"on_update": ["crm.api.todo.on_update"],
+		"on_trash": ["crm.fcrm.doctype.crm_assignment_index.crm_assignment_index.on_todo_trash"],
 	},
 	"Comment": {
-		"on_update": ["crm.api.comment.on_update"],
+		"on_update": [
+			"crm.api.comment.on_update",
+			"crm.fcrm.doctype.crm_activity.crm_activity.sync_activity",
+		],
+		"on_trash": ["crm.fcrm.doctype.crm_activity.crm_activity.remove_activity"],
+	},
+	"Version": {
+		"after_insert": ["crm.api.activities.cache_version_activity"],
+		"on_update": ["crm.fcrm.doctype.crm_activity.crm_activity.sync_activity"],
+	},
+	"Communication": {
+		"on_update": ["crm.fcrm.doctype.crm_activity.crm_activity.sync_activity"],
+		"on_trash": ["crm.fcrm.doctype.crm_activity.crm_activity.remove_activity"],
+	},
+	"File": {
+		"on_update": ["crm.fcrm.doctype.crm_activity.crm_activity.sync_activity"],
+		"on_trash": ["crm.fcrm.doctype.crm_activity.crm_activity.remove_activity"],
+	},
+	"CRM Call Log": {
+		"on_update": ["crm.fcrm.doctype.crm_activity.crm_activity.sync_activity"],
+		"on_trash": ["crm.fcrm.doctype.crm_activity.crm_activity.remove_activity"],
+	},
+	"FCRM Note": {
+		"on_update": ["crm.fcrm.doctype.crm_activity.crm_activity.sync_activity"],
+		"on_trash": ["crm.fcrm.doctype.crm_activity.crm_activity.remove_activity"],
 	},
 	"WhatsApp Message": {
 		"validate": ["crm.api.whatsapp.validate"],
@@ -177,7 +247,27 @@ doc_events = {
 	"User": {
 		"before_validate": ["crm.api.demo.validate_user"],
 		"validate_reset_password": ["crm.api.demo.validate_reset_password"],
-	}
+	},
+	"CRM View Settings": {
+		"on_update": ["crm.api.view_schema.on_schema_change"],
+		"on_trash": ["crm.api.view_schema.on_schema_change"],
+	},
+	"CRM Form Script": {
+		"on_update": ["crm.api.view_schema.on_schema_change"],
+		"on_trash": ["crm.api.view_schema.on_schema_change"],
+	},
+	"Custom Field": {
+		"on_update": ["crm.api.view_schema.on_schema_change", "crm.utils.clear_link_fields_cache"],
+		"on_trash": ["crm.api.view_schema.on_schema_change", "crm.utils.clear_link_fields_cache"],
+	},
+	"Property Setter": {
+		"on_update": ["crm.api.view_schema.on_schema_change", "crm.utils.clear_link_fields_cache"],
+		"on_trash": ["crm.api.view_schema.on_schema_change", "crm.utils.clear_link_fields_cache"],
+	},
+	"DocType": {
+		"on_update": ["crm.api.view_schema.on_schema_change", "crm.utils.clear_link_fields_cache"],
+		"on_trash": ["crm.utils.clear_link_fields_cache"],
+	},
 }
 
 # Scheduled Tasks
@@ -189,6 +279,13 @@ scheduler_events = {
 	]
 }
 
+# Log Clearing
+# ---------------
+
+default_log_clearing_doctypes = {
+	"CRM Deletion Log": 7,
+}
+
 # Workspace
 # ---------------
 
@@ -218,7 +315,12 @@ scheduler_events = {
 # Ignore links to specified DocTypes when deleting documents
 # -----------------------------------------------------------
 
-# ignore_links_on_delete = ["Communication", "ToDo"]
+ignore_links_on_delete = [
+	"CRM Assignment Index",
+	"CRM Record Visibility",
+	"CRM Activity",
+	"CRM Phone Index",
+]
 
 # Request Events
 # ----------------
@@ -1,7 +1,6 @@
 import frappe
-from frappe.query_builder import Order
-from pypika.functions import Replace
 
+from crm.fcrm.doctype.crm_phone_index.crm_phone_index import find_by_phone_numbers
 from crm.utils import are_same_phone_number, parse_phone_number
 
 
@@ -119,75 +118,89 @@ def add_task_to_call_log(call_sid, task):
 @frappe.whitelist()
 def get_contact_by_phone_number(phone_number):
 	"""Get contact by phone number."""
-	number = parse_phone_number(phone_number)
+	return get_contacts_by_phone_numbers([phone_number])[phone_number]
 
-	if number.get("is_valid"):
-		return get_contact(number.get("national_number"), number.get("country"))
-	else:
-		return get_contact(phone_number, number.get("country"), exact_match=True)
+
+def get_contacts_by_phone_numbers(phone_numbers):
+	"""Get contacts of many phone numbers like `get_contact_by_phone_number`, with one query per doctype."""
+	lookups = {}
+	for phone_number in set(phone_numbers):
+		number = parse_phone_number(phone_number)
+		if number.get("is_valid"):
+			lookups[phone_number] = (number.get("national_number"), number.get("country"), False)
+		else:
+			lookups[phone_number] = (phone_number, number.get("country"), True)
+	return get_contacts(lookups)
 
 
 def get_contact(phone_number, country="IN", exact_match=False):
-	if not phone_number:
-		return {"mobile_no": phone_number}
-
-	cleaned_number = (
-		phone_number.strip()
-		.replace(" ", "")
-		.replace("-", "")
-		.replace("(", "")
-		.replace(")", "")
-		.replace("+", "")
-	)
-
-	# Check if the number is associated with a contact
-	Contact = frappe.qb.DocType("Contact")
-	normalized_phone = Replace(
-		Replace(Replace(Replace(Replace(Contact.mobile_no, " ", ""), "-", ""), "(", ""), ")", ""), "+", ""
-	)
-
-	query = (
-		frappe.qb.from_(Contact)
-		.select(Contact.name, Contact.full_name, Contact.image, Contact.mobile_no)
-		.where(normalized_phone.like(f"%{cleaned_number}%"))
-		.orderby("modified", order=Order.desc)
-	)
-	contacts = query.run(as_dict=True)
-
-	if len(contacts):
-		# Check if the contact is associated with a deal
-		for contact in contacts:
-			if frappe.db.exists("CRM Contacts", {"contact": contact.name, "is_primary": 1}):
-				deal = frappe.db.get_value(
-					"CRM Contacts", {"contact": contact.name, "is_primary": 1}, "parent"
-				)
-				if are_same_phone_number(contact.mobile_no, phone_number, country, validate=not exact_match):
-					contact["deal"] = deal
-					return contact
-		# Else, return the first contact
-		if are_same_phone_number(contacts[0].mobile_no, phone_number, country, validate=not exact_match):
-			return contacts[0]
-
-	# Else, Check if the number is associated with a lead
-	Lead = frappe.qb.DocType("CRM Lead")
-	normalized_phone = Replace(
-		Replace(Replace(Replace(Replace(Lead.mobile_no, " ", ""), "-", ""), "(", ""), ")", ""), "+", ""
-	)
-
-	query = (
-		frappe.qb.from_(Lead)
-		.select(Lead.name, Lead.lead_name, Lead.image, Lead.mobile_no)
-		.where(Lead.converted == 0)
-		.where(normalized_phone.like(f"%{cleaned_number}%"))
-		.orderby("modified", order=Order.desc)
-	)
-	leads = query.run(as_dict=True)
-
-	if len(leads):
-		for lead in leads:
-			if are_same_phone_number(lead.mobile_no, phone_number, country, validate=not exact_match):
-				lead["lead"] = lead.name
-				lead["full_name"] = lead.lead_name
-				return lead
-
-	return {"mobile_no": phone_number}
+	return get_contacts({phone_number: (phone_number, country, exact_match)})[phone_number]
+
+
+def get_contacts(lookups):
+	"""
+	{key: contact, deal contact or lead} of {key: (phone_number, country, exact_match)} lookups
+
+	A contact that is the primary contact of a deal is preferred, then the most recently
+	modified contact, then an unconverted lead.
+	"""
+	results = {key: {"mobile_no": phone_number} for key, (phone_number, __, __) in lookups.items()}
+	lookups = {key: lookup for key, lookup in lookups.items() if lookup[0]}
+
+	# Check if the numbers are associated with contacts
+	contact_matches = get_matches("Contact", lookups)
+	if contact_names := list({name for names in contact_matches.values() for name in names}):
+		contacts = frappe.get_all(
+			"Contact",
+			filters={"name": ("in", contact_names)},
+			fields=["name", "full_name", "image", "mobile_no"],
+			order_by="modified desc",
+		)
+		deals = dict(
+			frappe.get_all(
+				"CRM Contacts",
+				filters={"contact": ("in", contact_names), "is_primary": 1},
+				fields=["contact", "parent"],
+				as_list=True,
+			)
+		)
+		for key, names in contact_matches.items():
+			matched = [contact for contact in contacts if contact.name in names]
+			# Check if the contact is associated with a deal, else return the first contact
+			for contact in matched:
+				if deal := deals.get(contact.name):
+					results[key] = frappe._dict(contact, deal=deal)
+					break
+			else:
+				if matched:
+					results[key] = matched[0]
+
+	# Else, Check if the numbers are associated with leads
+	lookups = {key: lookup for key, lookup in lookups.items() if not results[key].get("name")}
+	lead_matches = get_matches("CRM Lead", lookups)
+	if lead_names := list({name for names in lead_matches.values() for name in names}):
+		leads = frappe.get_all(
+			"CRM Lead",
+			filters={"name": ("in", lead_names), "converted": 0},
+			fields=["name", "lead_name", "image", "mobile_no"],
+			order_by="modified desc",
+		)
+		for key, names in lead_matches.items():
+			if lead := next((lead for lead in leads if lead.name in names), None):
+				results[key] = frappe._dict(lead, lead=lead.name, full_name=lead.lead_name)
+
+	return results
+
+
+def get_matches(doctype, lookups):
+	"""{key: names} of `doctype` with a number confirmed to be the looked up one"""
+	candidates = find_by_phone_numbers(doctype, {phone_number for phone_number, __, __ in lookups.values()})
+	matches = {}
+	for key, (phone_number, country, exact_match) in lookups.items():
+		if names := {
+			row.reference_name
+			for row in candidates[phone_number]
+			if are_same_phone_number(row.phone, phone_number, country, validate=not exact_match)
+		}:
+			matches[key] = names
+	return matches
@@ -0,0 +1,5 @@
+from crm.fcrm.doctype.crm_assignment_index.crm_assignment_index import rebuild_assignment_index
+
+
+def execute():
+	rebuild_assignment_index()
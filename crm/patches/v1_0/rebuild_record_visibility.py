@@ -0,0 +1,5 @@
+from crm.fcrm.doctype.crm_record_visibility.crm_record_visibility import rebuild_record_visibility
+
+
+def execute():
+	rebuild_record_visibility()
@@ -1,40 +1,39 @@
 import frappe
+from frappe.utils.caching import request_cache
 
-def get_permission_query_conditions_for_assignable_doc(doctype, user=None, owner_field="owner"):
+MANAGER_ROLES = ["System Manager", "Sales Manager", "Support Manager"]
+
+
+@request_cache
+def is_crm_manager(user):
+    """Whether `user` sees every assignable document, memoized for the current request"""
+    return any(role in MANAGER_ROLES for role in frappe.get_roles(user))
+
+
+def get_permission_query_conditions_for_assignable_doc(doctype, user=None):
     """Universal permission query conditions for assignable documents"""
     if not user:
         user = frappe.session.user
-        
-    if "System Manager" in frappe.get_roles(user) or any(role in frappe.get_roles(user) for role in ["Sales Manager", "Support Manager"]):
+
+    if is_crm_manager(user):
         return ""
 
-    # User can see documents they own
-    conditions = [f"`tab{doctype}`.{owner_field} = '{user}'"]
-    
-    # User can see documents shared with them (via DocShare from ToDo assignments)
-    shared_docs = frappe.db.sql("""
-        SELECT share_name
-        FROM `tabDocShare`
-        WHERE
-            share_doctype=%s
-            AND user=%s
-            AND `read`=1
-    """, (doctype, user), as_dict=1)
-    
-    if shared_docs:
-        doc_names = ["'" + d.share_name + "'" for d in shared_docs]
-        conditions.append(f"`tab{doctype}`.name in ({','.join(doc_names)})")
-    
-    return "(" + " OR ".join(conditions) + ")"
+    # Owned and shared records are materialized in CRM Record Visibility, so the condition is a
+    # single lookup on its (user, reference_doctype, reference_name) index
+    return f"""`tab{doctype}`.name in (
+        select `tabCRM Record Visibility`.reference_name from `tabCRM Record Visibility`
+        where `tabCRM Record Visibility`.user = {frappe.db.escape(user)}
+            and `tabCRM Record Visibility`.reference_doctype = {frappe.db.escape(doctype)}
+    )"""
 
 def get_permission_query_conditions_for_crm_deal(user=None):
     """Permission query conditions for CRM Deal"""
-    return get_permission_query_conditions_for_assignable_doc("CRM Deal", user, owner_field="deal_owner")
+    return get_permission_query_conditions_for_assignable_doc("CRM Deal", user)
 
 def get_permission_query_conditions_for_crm_lead(user=None):
     """Permission query conditions for CRM Lead"""
-    return get_permission_query_conditions_for_assignable_doc("CRM Lead", user, owner_field="lead_owner")
+    return get_permission_query_conditions_for_assignable_doc("CRM Lead", user)
 
 def get_permission_query_conditions_for_crm_task(user=None):
     """Permission query conditions for CRM Task"""
-    return get_permission_query_conditions_for_assignable_doc("CRM Task", user) 
\ No newline at end of file
+    return get_permission_query_conditions_for_assignable_doc("CRM Task", user) 
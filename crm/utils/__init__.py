@@ -119,11 +119,24 @@ def seconds_to_duration(seconds):
 		return "0s"
 
 
+def get_cached_link_fields(doctype):
+	"""`get_link_fields` of `doctype`, cached until meta of any doctype changes"""
+	link_fields = frappe.cache().hget("crm_link_fields", doctype)
+	if link_fields is None:
+		from frappe.model.rename_doc import get_link_fields
+
+		link_fields = get_link_fields(doctype)
+		frappe.cache().hset("crm_link_fields", doctype, link_fields)
+	return link_fields
+
+
+def clear_link_fields_cache(doc=None, method=None):
+	frappe.cache().delete_value("crm_link_fields")
+
+
 # Extracted from frappe core frappe/model/delete_doc.py/check_if_doc_is_linked
 def get_linked_docs(doc, method="Delete"):
-	from frappe.model.rename_doc import get_link_fields
-
-	link_fields = get_link_fields(doc.doctype)
+	link_fields = get_cached_link_fields(doc.doctype)
 	ignored_doctypes = set()
 
 	if method == "Cancel" and (doc_ignore_flags := doc.get("ignore_linked_doctypes")):
@@ -247,6 +260,92 @@ def get_dynamic_linked_docs(doc, method="Delete"):
 	return docs
 
 
+def get_linked_docs_for_names(doctype, names):
+	"""
+	Batch version of `get_linked_docs` and `get_dynamic_linked_docs` for deletion
+
+	Finds the documents linking to any of `names` with one query per link field
+	instead of one per link field and document.
+	"""
+	names = list(names)
+	if not names:
+		return []
+
+	ignored_doctypes = set(frappe.get_hooks("ignore_links_on_delete"))
+	docs = []
+
+	for lf in get_cached_link_fields(doctype):
+		link_dt, link_field = lf["parent"], lf["fieldname"]
+		if lf["issingle"] or link_dt in ignored_doctypes:
+			continue
+
+		try:
+			meta = frappe.get_meta(link_dt)
+		except frappe.DoesNotExistError:
+			frappe.clear_last_message()
+			continue
+
+		fields = ["name", link_field]
+		if meta.istable:
+			fields.extend(["parent", "parenttype"])
+
+		for item in frappe.get_all(link_dt, filters={link_field: ("in", names)}, fields=fields):
+			item_parent = item.get("parent")
+			linked_parent_doctype = item.parenttype if item_parent else link_dt
+			reference_docname = item_parent or item.name
+
+			if linked_parent_doctype in ignored_doctypes:
+				continue
+			# don't unlink the document itself
+			if link_dt == doctype and reference_docname == item.get(link_field):
+				continue
+
+			docs.append(
+				{
+					"doc": item.get(link_field),
+					"reference_doctype": linked_parent_doctype,
+					"reference_docname": reference_docname,
+				}
+			)
+
+	for df in get_dynamic_link_map().get(doctype, []):
+		if df.parent in ignored_doctypes:
+			continue
+
+		meta = frappe.get_meta(df.parent)
+		if meta.issingle:
+			continue
+
+		fields = ["name", df.fieldname]
+		if meta.istable:
+			fields.extend(["parent", "parenttype"])
+
+		for refdoc in frappe.get_all(
+			df.parent,
+			filters={
+				df.options: doctype,
+				df.fieldname: ("in", names),
+				"docstatus": ("!=", DocStatus.cancelled()),
+			},
+			fields=fields,
+		):
+			reference_doctype = refdoc.parenttype if meta.istable else df.parent
+			reference_docname = refdoc.parent if meta.istable else refdoc.name
+
+			if reference_doctype in ignored_doctypes:
+				continue
+
+			docs.append(
+				{
+					"doc": refdoc.get(df.fieldname),
+					"reference_doctype": reference_doctype,
+					"reference_docname": reference_docname,
+				}
+			)
+
+	return docs
+
+
 def is_admin(user: str | None = None) -> bool:
 	"""
 	Check whether `user` is an admin
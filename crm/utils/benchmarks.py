@@ -0,0 +1,51 @@
+"""
+Micro-benchmarks for hot paths of the activity timeline
+
+Run with `bench --site <site> execute crm.utils.benchmarks.benchmark_html_parsers`.
+"""
+
+import timeit
+
+from crm.api.activities import parse_attachment_log, parse_attachment_log_with_soup
+from crm.api.comment import extract_mentions, extract_mentions_with_soup
+
+
+def benchmark_html_parsers(items=500, number=5):
+	"""Compare the streaming attachment log and mention parsers with BeautifulSoup"""
+	attachment_logs = [
+		f'<a href="/private/files/report-{i}.pdf" target="_blank">report-{i}.pdf</a>' for i in range(items)
+	]
+	comment = "".join(
+		f'<p>Paragraph {i} for <span class="mention" data-type="mention" data-id="user{i}@example.com" '
+		f'data-label="User {i}">@User {i}</span> with <b>some</b> <i>formatting</i>.</p>'
+		for i in range(items)
+	)
+
+	results = {
+		"attachment_logs": compare(
+			lambda: [parse_attachment_log(log, "Attachment") for log in attachment_logs],
+			lambda: [parse_attachment_log_with_soup(log, "added") for log in attachment_logs],
+			number,
+		),
+		"mentions": compare(
+			lambda: extract_mentions(comment),
+			lambda: extract_mentions_with_soup(comment),
+			number,
+		),
+	}
+
+	for name, result in results.items():
+		print(
+			f"{name}: html.parser {result['parser']:.4f}s, BeautifulSoup {result['soup']:.4f}s, "
+			f"{result['speedup']:.1f}x faster"
+		)
+	return results
+
+
+def compare(parser, soup, number):
+	if parser() != soup():
+		raise AssertionError("Parser results differ from BeautifulSoup")
+
+	parser_time = timeit.timeit(parser, number=number)
+	soup_time = timeit.timeit(soup, number=number)
+	return {"parser": parser_time, "soup": soup_time, "speedup": soup_time / parser_time}
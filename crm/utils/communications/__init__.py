@@ -1,12 +1,22 @@
 import frappe
 
-def get_attachments(doctype, name):
-    """Get attachments for a document"""
-    return frappe.db.get_all(
+def get_attachments_by_name(doctype, names):
+    """Attachments of several documents with one File query, grouped by document name"""
+    attachments = {}
+    if not names:
+        return attachments
+
+    files = frappe.db.get_all(
         "File",
-        filters={"attached_to_doctype": doctype, "attached_to_name": name},
-        fields=["name", "file_name", "file_type", "file_url", "file_size", "is_private", "creation", "owner"],
-    ) or []
+        filters={"attached_to_doctype": doctype, "attached_to_name": ("in", list(set(names)))},
+        fields=[
+            "name", "file_name", "file_type", "file_url", "file_size", "is_private", "modified", "creation", "owner",
+            "attached_to_name",
+        ],
+    )
+    for file in files:
+        attachments.setdefault(file.pop("attached_to_name"), []).append(file)
+    return attachments
 
 def get_communication_medium(communication):
     """Get communication medium with fallback"""
@@ -23,6 +33,7 @@ def get_communication_medium(communication):
 def prepare_communication_activity(communication, is_lead=True):
     """Prepare communication activity object with proper medium handling"""
     return {
+        "name": communication.name,
         "activity_type": "communication",
         "communication_type": communication.communication_type,
         "communication_date": communication.communication_date or communication.creation,
@@ -31,12 +42,14 @@ def prepare_communication_activity(communication, is_lead=True):
         "data": {
             "subject": communication.subject,
             "content": communication.content,
+            "content_truncated": getattr(communication, 'content_truncated', 0),
             "sender_full_name": communication.sender_full_name,
             "sender": communication.sender,
             "recipients": communication.recipients,
             "cc": communication.cc,
             "bcc": communication.bcc,
-            "attachments": get_attachments('Communication', communication.name),
+            # filled for a whole page by crm.api.activities.load_attachments
+            "attachments": [],
             "read_by_recipient": communication.read_by_recipient,
             "delivery_status": communication.delivery_status
         },
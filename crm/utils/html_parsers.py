@@ -0,0 +1,100 @@
+"""
+Streaming parsers for the fixed HTML shapes read on every timeline and comment save
+
+Attachment logs and mentions only need one tag's attributes and text, so they are read with
+`html.parser.HTMLParser` instead of building a BeautifulSoup tree. Input the parsers can't read
+with certainty falls back to BeautifulSoup, so results always match the BeautifulSoup versions.
+"""
+
+from html.parser import HTMLParser
+
+import frappe
+
+
+class FirstLinkParser(HTMLParser):
+	"""Reads the `href` and text of the first `<a>` tag"""
+
+	def __init__(self):
+		super().__init__(convert_charrefs=True)
+		self.found = False
+		self.closed = False
+		self.nested = False
+		self.href = None
+		self.text = []
+
+	def handle_starttag(self, tag, attrs):
+		if tag != "a" or self.closed:
+			return
+		if self.found:
+			self.nested = True
+			return
+		self.found = True
+		self.href = dict(attrs).get("href")
+
+	def handle_endtag(self, tag):
+		if tag == "a" and self.found:
+			self.closed = True
+
+	def handle_data(self, data):
+		if self.found and not self.closed:
+			self.text.append(data)
+
+
+class MentionParser(HTMLParser):
+	"""Collects the attributes of `<span data-type="mention">` tags"""
+
+	def __init__(self):
+		super().__init__(convert_charrefs=True)
+		self.mentions = []
+
+	def handle_starttag(self, tag, attrs):
+		if tag != "span":
+			return
+		attrs = dict(attrs)
+		if attrs.get("data-type") == "mention":
+			self.mentions.append(
+				frappe._dict(
+					full_name=get_attribute(attrs, "data-label"), email=get_attribute(attrs, "data-id")
+				)
+			)
+
+	def handle_startendtag(self, tag, attrs):
+		self.handle_starttag(tag, attrs)
+
+
+def get_attribute(attrs, name):
+	# attributes without a value are None here but "" in BeautifulSoup
+	if name not in attrs:
+		return None
+	return attrs[name] or ""
+
+
+def parse_first_link(html):
+	"""
+	`(found, href, text)` of the first link in `html`
+
+	Returns None when the link has no href, contains another link or is not closed, where
+	BeautifulSoup is needed to reproduce its result.
+	"""
+	parser = FirstLinkParser()
+	try:
+		parser.feed(html)
+		parser.close()
+	except Exception:
+		return None
+
+	if not parser.found:
+		return False, None, None
+	if parser.href is None or parser.nested or not parser.closed:
+		return None
+	return True, parser.href, "".join(parser.text)
+
+
+def parse_mentions(html):
+	parser = MentionParser()
+	try:
+		parser.feed(html)
+		parser.close()
+	except Exception:
+		return None
+	return parser.mentions
@@ -468,7 +468,7 @@ export function initSocket() {
   })
 
   // Handle doc update events from server
-  socket.on('doc_update', ({ doctype, name, data }) => {
+  const handleDocUpdate = ({ doctype, name, data }) => {
     const key = `${doctype}:${name}`
     logger.log(`[Socket] Received doc_update event for ${key}:`, data)
     
@@ -544,6 +544,13 @@ export function initSocket() {
     } else {
       logger.log(`[Socket] No subscribers found for ${key}`)
     }
+  }
+  socket.on('doc_update', handleDocUpdate)
+
+  // Bulk updates publish the documents of a whole chunk in one event
+  socket.on('docs_update', ({ doctype, names, data }) => {
+    logger.log(`[Socket] Received docs_update event for ${names.length} ${doctype} documents`)
+    names.forEach((name) => handleDocUpdate({ doctype, name, data }))
   })
 
   return socket